@@ -1,16 +1,19 @@
 import sys
-from pathlib import Path
-import time
 
-# Add project root to sys.path so "from src.*" imports work
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+if not __package__:
+    # Launched as a script (python src/app.py, PyInstaller): make the project
+    # root importable so "from src.*" works. Installed runs skip this.
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from PyQt6.QtWidgets import QApplication, QSplashScreen
 from PyQt6.QtGui import QPixmap
 from PyQt6.QtCore import Qt
 from src.main_window import MainWindow
 
-if __name__ == "__main__":
+
+def main():
     app = QApplication(sys.argv)
     # splash_pix = QPixmap(r"C:\Users\M297802\Desktop\CT-PCD-GUI\src\splash.png")
     # splash = QSplashScreen(splash_pix)
@@ -36,3 +39,7 @@ if __name__ == "__main__":
     window = MainWindow()
     # splash.finish(window)
     sys.exit(app.exec())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from pathlib import Path
+import os
 from PyQt6.QtWidgets import (
     QDockWidget,
     QWidget,
@@ -47,6 +47,8 @@ class DicomDetailsDock(QDockWidget):
         ("Rescale Intercept", "RescaleIntercept"),
         ("Rescale Slope", "RescaleSlope"),
     ]
+    # Only these elements are parsed from the header
+    _SPECIFIC_TAGS = [kw for _, kw in DISPLAY_TAGS]
 
     def __init__(self, parent=None):
         super().__init__("DICOM Details", parent)
@@ -58,6 +60,9 @@ class DicomDetailsDock(QDockWidget):
             QFormLayout.FieldGrowthPolicy.ExpandingFieldsGrow
         )
         self.fields: dict[str, QLineEdit] = {}
+        # Build all rows with layout/repaint suspended; one pass at the end
+        self.form_widget.setUpdatesEnabled(False)
+        self.form_layout.setEnabled(False)
         for label, kw in self.DISPLAY_TAGS:
             f = QLineEdit()
             f.setReadOnly(True)
@@ -72,6 +77,9 @@ class DicomDetailsDock(QDockWidget):
         self.folder_field.setReadOnly(True)
         self.folder_field.setPlaceholderText("--")
         self.form_layout.addRow("Folder:", self.folder_field)
+        self.form_layout.setEnabled(True)
+        self.form_layout.invalidate()
+        self.form_widget.setUpdatesEnabled(True)
         scroll.setWidget(self.form_widget)
         self.setWidget(scroll)
 
@@ -84,16 +92,22 @@ class DicomDetailsDock(QDockWidget):
     def populate_from_folder(self, dicom_folder):
         self.clear()
         self.folder_field.setText(dicom_folder)
-        folder = Path(dicom_folder)
-        dcm_files = sorted(
-            f for f in folder.iterdir() if f.is_file() and not f.name.startswith(".")
-        )
-        if not dcm_files:
+        # Single pass: count files and keep the first name in sort order
+        count, first = 0, None
+        with os.scandir(dicom_folder) as it:
+            for e in it:
+                if not e.name.startswith(".") and e.is_file():
+                    count += 1
+                    if first is None or e.name < first.name:
+                        first = e
+        if not count:
             self.slices_field.setText("No files found")
             return
-        self.slices_field.setText(str(len(dcm_files)))
+        self.slices_field.setText(str(count))
         try:
-            ds = pydicom.dcmread(str(dcm_files[0]), stop_before_pixels=True)
+            ds = pydicom.dcmread(
+                first.path, stop_before_pixels=True, specific_tags=self._SPECIFIC_TAGS
+            )
         except Exception as e:
             self.slices_field.setText(f"Error: {e}")
             return
@@ -1,7 +1,7 @@
-from pathlib import Path
+import os
 from typing import Optional
+import numpy as np
 from PyQt6.QtWidgets import (
-    QFileDialog,
     QLabel,
     QDockWidget,
     QWidget,
@@ -18,7 +18,7 @@ from PyQt6.QtWidgets import (
     QSpinBox,
 )
 from PyQt6.QtCore import Qt
-from src.widgets import LesionViewerWidget
+from src.widgets import LesionViewerWidget, pick_folder
 
 
 # ===========================================================================
@@ -124,6 +124,8 @@ class LesionLibraryDock(QDockWidget):
     def bind_lesion_viewer(self, viewer: LesionViewerWidget):
         self._lesion_viewer = viewer
         viewer.smoothing_iterations = self.smooth_spin.value()
+        # The viewer may be created after spacing was set; bring it up to date
+        self._on_spacing_toggle(self.use_dicom_cb.isChecked())
 
     def set_library_dir(self, path: str):
         self._library_dir = path
@@ -131,6 +133,12 @@ class LesionLibraryDock(QDockWidget):
         self._refresh_list()
 
     def set_dicom_spacing(self, spacing: list):
+        # Each load reports spacing from the header scan and again from the
+        # loaded series; a repeat must not re-extract the lesion surface
+        if self._dicom_spacing is not None and np.allclose(
+            spacing, self._dicom_spacing, rtol=1e-6
+        ):
+            return
         self._dicom_spacing = spacing
         self.dicom_spacing_label.setText(
             f"DICOM spacing: ({spacing[0]:.4f}, {spacing[1]:.4f}, {spacing[2]:.4f})"
@@ -147,22 +155,29 @@ class LesionLibraryDock(QDockWidget):
         self.spin_z.setValue(spacing[2])
 
     def _browse_dir(self):
-        d = QFileDialog.getExistingDirectory(self, "Select Lesion Library Folder")
-        if d:
-            self.set_library_dir(d)
+        pick_folder(self, "Select Lesion Library Folder", self.set_library_dir)
 
     def _refresh_list(self):
         self.file_list.clear()
-        if not self._library_dir:
-            return
-        lib = Path(self._library_dir)
-        if not lib.is_dir():
+        if not self._library_dir or not os.path.isdir(self._library_dir):
             return
-        mat_files = sorted(lib.glob("*.mat"))
-        for f in mat_files:
-            item = QListWidgetItem(f.name)
-            item.setData(Qt.ItemDataRole.UserRole, str(f))
-            self.file_list.addItem(item)
+        with os.scandir(self._library_dir) as it:
+            entries = [
+                e
+                for e in it
+                if e.name.endswith(".mat")
+                and not e.name.startswith(".")
+                and e.is_file()
+            ]
+        entries.sort(key=lambda e: e.name)
+        self.file_list.setUpdatesEnabled(False)
+        try:
+            for e in entries:
+                item = QListWidgetItem(e.name)
+                item.setData(Qt.ItemDataRole.UserRole, e.path)
+                self.file_list.addItem(item)
+        finally:
+            self.file_list.setUpdatesEnabled(True)
 
     def _load_selected(self):
         item = self.file_list.currentItem()
@@ -13,11 +13,23 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtGui import QColor
 from PyQt6.QtCore import Qt
 from src.models import DrawTool
+from src.models.roi_manager import ROI_COLORS
 
 # ===========================================================================
 # ROI Tools dock
 # ===========================================================================
 
+_QCOLOR_CACHE = {
+    c: QColor(int(c[0] * 255), int(c[1] * 255), int(c[2] * 255)) for c in ROI_COLORS
+}
+
+
+def _qcolor(color):
+    qc = _QCOLOR_CACHE.get(tuple(color))
+    if qc is None:
+        qc = _QCOLOR_CACHE[tuple(color)] = QColor(*(int(x * 255) for x in color))
+    return qc
+
 
 class ROIToolsDock(QDockWidget):
     def __init__(self, parent=None):
@@ -78,6 +90,7 @@ class ROIToolsDock(QDockWidget):
 
         self._viewer = None
         self._mgr = None
+        self._items: dict[int, QListWidgetItem] = {}
         self._syncing = False
         self.btn_delete.clicked.connect(self._del)
         self.btn_clear.clicked.connect(self._clear)
@@ -85,9 +98,15 @@ class ROIToolsDock(QDockWidget):
         self.btn_goto.clicked.connect(self._goto)
 
     def bind_viewer(self, viewer):
+        if viewer is self._viewer:
+            # Already bound; the manager's signals keep the list in sync
+            return
         self._viewer = viewer
         self._mgr = viewer.roi_manager
         self._mgr.rois_changed.connect(self._refresh)
+        self._mgr.roi_added.connect(self._append_item)
+        self._mgr.roi_removed.connect(self._remove_item)
+        self._mgr.roi_renamed.connect(self._update_item_text)
         self._mgr.selection_changed.connect(self._on_mgr_sel)
         viewer.drawing_cancelled.connect(self._reset_btns)
         self._refresh()
@@ -104,21 +123,46 @@ class ROIToolsDock(QDockWidget):
     def _refresh(self):
         self._syncing = True
         self.roi_list.clear()
+        self._items.clear()
         if not self._mgr:
             self._syncing = False
             return
         for roi in self._mgr.rois.values():
-            item = QListWidgetItem(
-                f"[{roi.roi_id}] {roi.name}  (slice {roi.slice_index+1})"
-            )
-            item.setData(Qt.ItemDataRole.UserRole, roi.roi_id)
-            r, g, b = (int(c * 255) for c in roi.color)
-            item.setForeground(QColor(r, g, b))
-            self.roi_list.addItem(item)
-            if roi.roi_id == self._mgr.selected_id:
-                self.roi_list.setCurrentItem(item)
+            self._add_item(roi)
+        self._syncing = False
+
+    @staticmethod
+    def _item_text(roi):
+        return f"[{roi.roi_id}] {roi.name}  (slice {roi.slice_index+1})"
+
+    def _add_item(self, roi):
+        item = QListWidgetItem(self._item_text(roi))
+        item.setData(Qt.ItemDataRole.UserRole, roi.roi_id)
+        item.setForeground(_qcolor(roi.color))
+        self.roi_list.addItem(item)
+        self._items[roi.roi_id] = item
+        if roi.roi_id == self._mgr.selected_id:
+            self.roi_list.setCurrentItem(item)
+
+    def _append_item(self, roi):
+        self._syncing = True
+        self._add_item(roi)
         self._syncing = False
 
+    def _remove_item(self, roi_id):
+        item = self._items.pop(roi_id, None)
+        if item is None:
+            return
+        self._syncing = True
+        self.roi_list.takeItem(self.roi_list.row(item))
+        self._syncing = False
+
+    def _update_item_text(self, roi_id):
+        item = self._items.get(roi_id)
+        roi = self._mgr.rois.get(roi_id) if self._mgr else None
+        if item and roi:
+            item.setText(self._item_text(roi))
+
     def _on_list_selection(self, current, _prev):
         if self._syncing or not current:
             return
@@ -132,12 +176,8 @@ class ROIToolsDock(QDockWidget):
         self._syncing = True
         if roi_id is None:
             self.roi_list.clearSelection()
-        else:
-            for i in range(self.roi_list.count()):
-                item = self.roi_list.item(i)
-                if item and item.data(Qt.ItemDataRole.UserRole) == roi_id:
-                    self.roi_list.setCurrentItem(item)
-                    break
+        elif roi_id in self._items:
+            self.roi_list.setCurrentItem(self._items[roi_id])
         self._syncing = False
 
     def _sel_id(self):
@@ -158,8 +198,7 @@ class ROIToolsDock(QDockWidget):
             else None
         )
         self._mgr.clear(ren)
-        if self._viewer.image_viewer:
-            self._viewer.image_viewer.Render()
+        self._viewer.request_render()
 
     def _rename(self):
         rid = self._sel_id()
@@ -1,12 +1,16 @@
-import math
+import numpy as np
 import vtkmodules.all as vtk
+from PyQt6.QtCore import QTimer
 from vtkmodules.vtkRenderingCore import (
     vtkActor,
     vtkPolyDataMapper,
 )
 from vtkmodules.vtkCommonDataModel import vtkPolyData, vtkCellArray
-from vtkmodules.vtkCommonCore import vtkPoints, vtkCommand, vtkIdList
+from vtkmodules.vtkCommonCore import vtkPoints, vtkCommand
+from vtkmodules.util.numpy_support import numpy_to_vtk
 from src.models import DrawTool
+from src.models.roi_manager import polyline_cells
+from src.interaction import kernels
 
 
 # ===========================================================================
@@ -17,12 +21,19 @@ from src.models import DrawTool
 class DrawingInteractorStyle(vtk.vtkInteractorStyleImage):
     HANDLE_PICK_PX = 10
     CONTOUR_PICK_PX = 8
+    ELLIPSE_SEGMENTS = 64
+    _UNIT_CIRCLE = np.stack(
+        [
+            np.cos(np.linspace(0, 2 * np.pi, ELLIPSE_SEGMENTS, endpoint=False)),
+            np.sin(np.linspace(0, 2 * np.pi, ELLIPSE_SEGMENTS, endpoint=False)),
+        ],
+        axis=1,
+    )
 
     def __init__(self, viewer_widget):
         super().__init__()
         self.viewer_widget = viewer_widget
         self.image_viewer = None
-        self.status_actor = None
         self.slice = 0
         self.min_slice = 0
         self.max_slice = 0
@@ -30,10 +41,26 @@ class DrawingInteractorStyle(vtk.vtkInteractorStyleImage):
         self.is_drawing = False
         self.current_points = []
         self.preview_actor = None
+        self._preview_pts = None
+        self._preview_lines = None
+        self._preview_poly = None
         self.anchor_point = None
+        self._last_sample_xy = None
+        self._last_raw_world = None  # latest freehand cursor point, kept or not
         self._dragging_vertex = None
         self._dragging_whole = False
         self._drag_start = None
+        self._display_mat = None
+        self._display_mat_inv = None
+        self._display_mat_key = None
+        self._picker = vtk.vtkWorldPointPicker()
+        self._origin = np.zeros(3)
+        self._spacing = np.ones(3)
+        # Coalesces mouse-move driven renders to ~60 Hz
+        self._render_timer = QTimer()
+        self._render_timer.setSingleShot(True)
+        self._render_timer.setInterval(16)
+        self._render_timer.timeout.connect(self._render)
 
         self.AddObserver(vtkCommand.MouseWheelForwardEvent, self._scroll_fwd)
         self.AddObserver(vtkCommand.MouseWheelBackwardEvent, self._scroll_bwd)
@@ -44,39 +71,49 @@ class DrawingInteractorStyle(vtk.vtkInteractorStyleImage):
         self.AddObserver(vtkCommand.RightButtonPressEvent, self._right_press)
         self.AddObserver(vtkCommand.LeftButtonDoubleClickEvent, self._double_click)
 
-    def setup(self, image_viewer, status_actor):
+    def setup(self, image_viewer):
         self.image_viewer = image_viewer
-        self.status_actor = status_actor
         self.slice = image_viewer.GetSliceMin()
         self.min_slice = image_viewer.GetSliceMin()
         self.max_slice = image_viewer.GetSliceMax()
-        self._update_status()
+        self.update_geometry()
 
-    def _update_status(self):
-        if not self.status_actor:
-            return
-        tool = self.draw_tool.upper() if self.draw_tool != DrawTool.NONE else ""
-        suffix = f"  [{tool}]" if tool else ""
-        self.status_actor.GetMapper().SetInput(
-            f"Slice {self.slice + 1}/{self.max_slice + 1}{suffix}"
-        )
+    def update_geometry(self):
+        """Cache origin/spacing of the displayed volume; call after the
+        viewer input changes."""
+        info = self.image_viewer.GetWindowLevel().GetInputInformation()
+        self._origin = np.array(info.Get(vtk.vtkDataObject.ORIGIN()))
+        self._spacing = np.array(info.Get(vtk.vtkDataObject.SPACING()))
+
+    @property
+    def is_interacting(self) -> bool:
+        """True during a built-in window/level, pan or zoom drag."""
+        return self.GetState() != 0  # VTKIS_NONE
 
     def _render(self):
-        if self.image_viewer:
+        self._render_timer.stop()
+        if self.image_viewer and not self.viewer_widget.render_suspended:
             self.image_viewer.Render()
 
+    def _schedule_render(self):
+        if not self._render_timer.isActive():
+            self._render_timer.start()
+
+    def _flush_render(self):
+        if self._render_timer.isActive():
+            self._render()
+
     def _set_slice(self, s):
         self.slice = s
         if self.image_viewer:
             self.image_viewer.SetSlice(s)
-            self._update_status()
             self.viewer_widget.roi_manager.update_visibility(
                 s, self.image_viewer.GetSliceOrientation()
             )
             # Notify the viewer widget so the corner overlay updates immediately
             if hasattr(self.viewer_widget, "_update_overlay_bl"):
                 self.viewer_widget._update_overlay_bl(s)
-            self._render()
+            self._schedule_render()
 
     def _scroll_fwd(self, _o, _e):
         if self.slice < self.max_slice:
@@ -105,62 +142,134 @@ class DrawingInteractorStyle(vtk.vtkInteractorStyleImage):
             self._cancel_drawing()
 
     def _pick_world(self):
+        """World point on the current slice under the last event position."""
+        return self.pick_world(self.GetInteractor().GetEventPosition())
+
+    def pick_world(self, display_xy):
+        """World point on the current slice under display position
+        *display_xy*."""
         if not self.image_viewer:
             return (0, 0, 0)
-        ix, iy = self.GetInteractor().GetEventPosition()
-        ren = self.image_viewer.GetRenderer()
-        picker = vtk.vtkWorldPointPicker()
-        picker.Pick(ix, iy, 0, ren)
-        wx, wy, wz = picker.GetPickPosition()
+        ix, iy = display_xy
+        orient, plane = self._slice_plane()
+        world = self._display_to_world(np.array([[ix, iy]], dtype=np.float64), plane)
+        if world is not None:
+            return tuple(world[0].tolist())
+        # View is edge-on to the slice: fall back to a z-buffer pick
+        self._picker.Pick(ix, iy, 0, self.image_viewer.GetRenderer())
+        w = np.array(self._picker.GetPickPosition())
+        w[orient] = plane
+        return tuple(w.tolist())
+
+    def _slice_plane(self):
+        """(axis, world coordinate) of the currently displayed slice."""
         orient = self.image_viewer.GetSliceOrientation()
-        img = self.image_viewer.GetInput()
-        origin, spacing = img.GetOrigin(), img.GetSpacing()
-        if orient == 2:
-            wz = origin[2] + self.slice * spacing[2]
-        elif orient == 1:
-            wy = origin[1] + self.slice * spacing[1]
-        elif orient == 0:
-            wx = origin[0] + self.slice * spacing[0]
-        return (wx, wy, wz)
+        return orient, self._origin[orient] + self.slice * self._spacing[orient]
+
+    def _display_to_world(self, xy, plane):
+        """Unproject (N, 2) display points onto the slice plane, or None if
+        the camera looks along the plane."""
+        self._display_matrix()
+        inv = self._display_mat_inv
+        orient = self.image_viewer.GetSliceOrientation()
+        ends = []
+        for depth in (0.0, 1.0):
+            hom = np.column_stack([xy, np.full(len(xy), depth), np.ones(len(xy))])
+            hom = hom @ inv.T
+            ends.append(hom[:, :3] / hom[:, 3:4])
+        near, far = ends
+        denom = far[:, orient] - near[:, orient]
+        if np.any(np.abs(denom) < 1e-12):
+            return None
+        t = (plane - near[:, orient]) / denom
+        world = near + t[:, None] * (far - near)
+        world[:, orient] = plane
+        return world
 
     def _display_pos(self):
         return self.GetInteractor().GetEventPosition()
 
-    def _world_to_display(self, pt):
-        if not self.image_viewer:
-            return (0, 0)
-        ren = self.image_viewer.GetRenderer()
-        ren.SetWorldPoint(pt[0], pt[1], pt[2], 1.0)
-        ren.WorldToDisplay()
-        dp = ren.GetDisplayPoint()
-        return (dp[0], dp[1])
-
     def _find_nearest_vertex(self, roi, threshold_px=None):
         if threshold_px is None:
             threshold_px = self.HANDLE_PICK_PX
         mx, my = self._display_pos()
-        best_idx, best_d = None, float("inf")
-        for i, pt in enumerate(roi.points):
-            dx, dy = self._world_to_display(pt)
-            d = math.hypot(dx - mx, dy - my)
-            if d < threshold_px and d < best_d:
-                best_d, best_idx = d, i
-        return best_idx
+        disp = self._project_roi_display(roi)
+        return kernels.nearest_vertex(mx, my, disp, threshold_px)[0]
 
     def _find_nearest_edge(self, roi, threshold_px=None):
         if threshold_px is None:
             threshold_px = self.CONTOUR_PICK_PX
         mx, my = self._display_pos()
-        n = len(roi.points)
-        best_idx, best_d = None, float("inf")
-        for i in range(n):
-            j = (i + 1) % n
-            ax, ay = self._world_to_display(roi.points[i])
-            bx, by = self._world_to_display(roi.points[j])
-            d = self._seg_dist(mx, my, ax, ay, bx, by)
-            if d < threshold_px and d < best_d:
-                best_d, best_idx = d, i
-        return best_idx
+        disp = self._project_roi_display(roi)
+        return kernels.nearest_edge(mx, my, disp, threshold_px)[0]
+
+    def _display_matrix(self):
+        """World -> display 4x4 for the active camera, rebuilt only when the
+        camera or window geometry changes."""
+        ren = self.image_viewer.GetRenderer()
+        cam = ren.GetActiveCamera()
+        w, h = ren.GetRenderWindow().GetSize()
+        vp = ren.GetViewport()
+        key = (cam.GetMTime(), w, h, tuple(vp))
+        if key != self._display_mat_key:
+            m = cam.GetCompositeProjectionTransformMatrix(
+                ren.GetTiledAspectRatio(), 0, 1
+            )
+            proj = np.array([[m.GetElement(i, j) for j in range(4)] for i in range(4)])
+            sx, sy = w * (vp[2] - vp[0]), h * (vp[3] - vp[1])
+            to_display = np.array(
+                [
+                    [sx / 2, 0.0, 0.0, sx / 2 + w * vp[0]],
+                    [0.0, sy / 2, 0.0, sy / 2 + h * vp[1]],
+                    [0.0, 0.0, 1.0, 0.0],
+                    [0.0, 0.0, 0.0, 1.0],
+                ]
+            )
+            self._display_mat = to_display @ proj
+            self._display_mat_inv = np.linalg.inv(self._display_mat)
+            self._display_mat_key = key
+        return self._display_mat
+
+    def _project_display(self, pts):
+        """Project an (N, 3) world array to (N, 2) display coordinates."""
+        m = self._display_matrix()
+        hom = pts @ m[:, :3].T + m[:, 3]
+        return hom[:, :2] / hom[:, 3:4]
+
+    def _display_rect_to_world(self, mx, my, pad):
+        """World-space (lo, hi) bounds of the display square of half-size
+        ``pad`` centred on (mx, my), intersected with the slice plane."""
+        xy = np.array(
+            [
+                [mx - pad, my - pad],
+                [mx + pad, my - pad],
+                [mx - pad, my + pad],
+                [mx + pad, my + pad],
+            ],
+            dtype=np.float64,
+        )
+        world = self._display_to_world(xy, self._slice_plane()[1])
+        if world is None:
+            return np.full(3, -np.inf), np.full(3, np.inf)
+        return world.min(axis=0), world.max(axis=0)
+
+    def _project_roi_display(self, roi):
+        """(N, 2) display coordinates of ``roi``, cached per ROI version and
+        view. Also refreshes ``roi._disp_bbox``."""
+        self._display_matrix()
+        key = (roi.version, self._display_mat_key)
+        if roi._disp_key != key:
+            disp = self._project_display(roi.points)
+            lo, hi = disp.min(axis=0), disp.max(axis=0)
+            roi._disp_pts = disp
+            roi._disp_bbox = (lo[0], lo[1], hi[0], hi[1])
+            roi._disp_key = key
+        return roi._disp_pts
+
+    def _roi_display_bbox(self, roi):
+        """Display-space (xmin, ymin, xmax, ymax) of ``roi``."""
+        self._project_roi_display(roi)
+        return roi._disp_bbox
 
     def _find_nearest_roi_on_slice(self):
         mgr = self.viewer_widget.roi_manager
@@ -168,28 +277,28 @@ class DrawingInteractorStyle(vtk.vtkInteractorStyleImage):
             return None
         orient = self.image_viewer.GetSliceOrientation()
         mx, my = self._display_pos()
-        best_id, best_d = None, float("inf")
-        for roi in mgr.rois.values():
-            if roi.slice_index != self.slice or roi.orientation != orient:
+        pad = self.CONTOUR_PICK_PX
+        lo, hi = self._display_rect_to_world(mx, my, pad)
+        rois = []
+        for roi in mgr.rois_in_bounds(self.slice, orient, lo, hi):
+            xmin, ymin, xmax, ymax = self._roi_display_bbox(roi)
+            if not (xmin - pad <= mx <= xmax + pad and ymin - pad <= my <= ymax + pad):
                 continue
-            n = len(roi.points)
-            for i in range(n):
-                j = (i + 1) % n
-                ax, ay = self._world_to_display(roi.points[i])
-                bx, by = self._world_to_display(roi.points[j])
-                d = self._seg_dist(mx, my, ax, ay, bx, by)
-                if d < self.CONTOUR_PICK_PX and d < best_d:
-                    best_d, best_id = d, roi.roi_id
-        return best_id
-
-    @staticmethod
-    def _seg_dist(px, py, ax, ay, bx, by):
-        dx, dy = bx - ax, by - ay
-        l2 = dx * dx + dy * dy
-        if l2 < 1e-12:
-            return math.hypot(px - ax, py - ay)
-        t = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / l2))
-        return math.hypot(px - (ax + t * dx), py - (ay + t * dy))
+            rois.append(roi)
+        if not rois:
+            return None
+        counts = np.array([len(roi.points) for roi in rois])
+        disp = np.concatenate([self._project_roi_display(roi) for roi in rois])
+        # Edge i runs from vertex i to the next vertex of the same (closed) ROI
+        nxt = np.arange(1, len(disp) + 1)
+        ends = np.cumsum(counts)
+        nxt[ends - 1] = ends - counts
+        owner = np.repeat([roi.roi_id for roi in rois], counts)
+        d2 = kernels.seg_dist_sq(mx, my, disp, disp[nxt])
+        best = int(np.argmin(d2))
+        if d2[best] < self.CONTOUR_PICK_PX * self.CONTOUR_PICK_PX:
+            return int(owner[best])
+        return None
 
     # ---- Dispatch ----
 
@@ -208,6 +317,7 @@ class DrawingInteractorStyle(vtk.vtkInteractorStyleImage):
             self.OnLeftButtonUp()
         else:
             self._draw_left_release()
+        self._flush_render()
 
     def _mouse_move(self, _o, _e):
         if self.draw_tool == DrawTool.EDIT:
@@ -240,7 +350,7 @@ class DrawingInteractorStyle(vtk.vtkInteractorStyleImage):
             mgr.insert_vertex(
                 roi.roi_id, edge, self._pick_world(), self.image_viewer.GetRenderer()
             )
-            self._render()
+            self.viewer_widget.request_render()
 
     # ---- Edit handlers ----
 
@@ -263,7 +373,7 @@ class DrawingInteractorStyle(vtk.vtkInteractorStyleImage):
                 self._drag_start = world
                 return
         mgr.select(self._find_nearest_roi_on_slice(), ren)
-        self._render()
+        self.viewer_widget.request_render()
 
     def _edit_mouse_move(self):
         mgr = self.viewer_widget.roi_manager
@@ -275,7 +385,7 @@ class DrawingInteractorStyle(vtk.vtkInteractorStyleImage):
             roi = mgr.selected_roi
             if roi:
                 mgr.update_point(roi.roi_id, self._dragging_vertex, world, ren)
-                self._render()
+                self._schedule_render()
             return
         if self._dragging_whole and self._drag_start:
             roi = mgr.selected_roi
@@ -285,7 +395,7 @@ class DrawingInteractorStyle(vtk.vtkInteractorStyleImage):
                 dz = world[2] - self._drag_start[2]
                 mgr.translate_roi(roi.roi_id, dx, dy, dz, ren)
                 self._drag_start = world
-                self._render()
+                self._schedule_render()
             return
         self.OnMouseMove()
 
@@ -304,7 +414,7 @@ class DrawingInteractorStyle(vtk.vtkInteractorStyleImage):
         vidx = self._find_nearest_vertex(roi, 15)
         if vidx is not None:
             mgr.delete_vertex(roi.roi_id, vidx, self.image_viewer.GetRenderer())
-            self._render()
+            self.viewer_widget.request_render()
 
     # ---- Draw handlers ----
 
@@ -313,6 +423,9 @@ class DrawingInteractorStyle(vtk.vtkInteractorStyleImage):
         if self.draw_tool == DrawTool.FREEHAND:
             self.is_drawing = True
             self.current_points = [w]
+            self._last_sample_xy = self._display_pos()
+            self._last_raw_world = w
+            self._start_freehand_preview(w)
         elif self.draw_tool == DrawTool.POLYGON:
             if not self.is_drawing:
                 self.is_drawing = True
@@ -349,8 +462,15 @@ class DrawingInteractorStyle(vtk.vtkInteractorStyleImage):
             return
         w = self._pick_world()
         if self.draw_tool == DrawTool.FREEHAND:
-            self.current_points.append(w)
-            self._update_preview()
+            # Drop samples closer than half the pick radius to the last one
+            self._last_raw_world = w
+            ix, iy = self._display_pos()
+            lx, ly = self._last_sample_xy
+            step = 0.5 * self.CONTOUR_PICK_PX
+            if (ix - lx) ** 2 + (iy - ly) ** 2 > step * step:
+                self.current_points.append(w)
+                self._last_sample_xy = (ix, iy)
+                self._append_preview_point(w)
         elif self.draw_tool == DrawTool.POLYGON:
             self._update_preview(extra=w)
         elif self.draw_tool in (DrawTool.RECTANGLE, DrawTool.ELLIPSE):
@@ -374,45 +494,64 @@ class DrawingInteractorStyle(vtk.vtkInteractorStyleImage):
         return [(x1, y1, z1), (x2, y1, z1), (x2, y2, z1), (x1, y2, z1)]
 
     @staticmethod
-    def _ellipse_pts(p1, p2, n=64):
+    def _ellipse_pts(p1, p2):
         cx, cy, cz = (p1[0] + p2[0]) / 2, (p1[1] + p2[1]) / 2, (p1[2] + p2[2]) / 2
         rx, ry = abs(p2[0] - p1[0]) / 2, abs(p2[1] - p1[1]) / 2
-        return [
-            (
-                cx + rx * math.cos(2 * math.pi * i / n),
-                cy + ry * math.sin(2 * math.pi * i / n),
-                cz,
-            )
-            for i in range(n)
-        ]
+        circle = DrawingInteractorStyle._UNIT_CIRCLE
+        xy = circle * np.array([rx, ry]) + np.array([cx, cy])
+        return np.column_stack([xy, np.full(len(circle), cz)])
 
     def _update_preview(self, extra=None):
         if not self.image_viewer:
             return
-        ren = self.image_viewer.GetRenderer()
-        if self.preview_actor:
-            ren.RemoveActor(self.preview_actor)
-        pts = list(self.current_points)
+        pts = np.array(self.current_points, dtype=np.float64).reshape(-1, 3)
         if extra:
-            pts.append(extra)
+            pts = np.vstack([pts, extra])
+        if self.preview_actor is None:
+            self._build_preview()
         if len(pts) < 2:
-            self._render()
+            self.preview_actor.SetVisibility(False)
+            self._schedule_render()
+            return
+        self._preview_pts.SetData(numpy_to_vtk(pts))
+        self._preview_poly.SetLines(
+            polyline_cells(len(pts), closed=self.draw_tool != DrawTool.FREEHAND)
+        )
+        self._preview_poly.Modified()
+        self.preview_actor.SetVisibility(True)
+        self._schedule_render()
+
+    def _start_freehand_preview(self, w):
+        """Fresh preview for a freehand stroke, grown one segment at a time
+        by _append_preview_point."""
+        if not self.image_viewer:
             return
-        vp = vtkPoints()
-        for p in pts:
-            vp.InsertNextPoint(p)
-        lines = vtkCellArray()
-        ids = vtkIdList()
-        for i in range(len(pts)):
-            ids.InsertNextId(i)
-        if self.draw_tool != DrawTool.FREEHAND:
-            ids.InsertNextId(0)
-        lines.InsertNextCell(ids)
-        pd = vtkPolyData()
-        pd.SetPoints(vp)
-        pd.SetLines(lines)
+        self._remove_preview()
+        self._build_preview()
+        self._preview_pts.InsertNextPoint(w)
+        self._preview_lines = vtkCellArray()
+        self._preview_poly.SetLines(self._preview_lines)
+
+    def _append_preview_point(self, w):
+        if self.preview_actor is None:
+            return
+        n = self._preview_pts.InsertNextPoint(w)
+        self._preview_lines.InsertNextCell(2)
+        self._preview_lines.InsertCellPoint(n - 1)
+        self._preview_lines.InsertCellPoint(n)
+        self._preview_pts.Modified()
+        self._preview_lines.Modified()
+        self._preview_poly.Modified()
+        self._schedule_render()
+
+    def _build_preview(self):
+        """Create the preview pipeline once; later updates only swap data."""
+        self._preview_pts = vtkPoints()
+        self._preview_poly = vtkPolyData()
+        self._preview_poly.SetPoints(self._preview_pts)
         mapper = vtkPolyDataMapper()
-        mapper.SetInputData(pd)
+        mapper.SetInputData(self._preview_poly)
+        mapper.SetStatic(True)
         self.preview_actor = vtkActor()
         self.preview_actor.SetMapper(mapper)
         self.preview_actor.GetProperty().SetColor(1, 1, 0)
@@ -423,16 +562,27 @@ class DrawingInteractorStyle(vtk.vtkInteractorStyleImage):
         offset = [0.0, 0.0, 0.0]
         offset[self.image_viewer.GetSliceOrientation()] = 0.5
         self.preview_actor.SetPosition(*offset)
-        ren.AddActor(self.preview_actor)
-        self._render()
+        self.image_viewer.GetRenderer().AddActor(self.preview_actor)
 
     def _remove_preview(self):
         if self.preview_actor and self.image_viewer:
             self.image_viewer.GetRenderer().RemoveActor(self.preview_actor)
-            self.preview_actor = None
+        self.preview_actor = None
+        self._preview_pts = self._preview_lines = self._preview_poly = None
 
     def _finalize_draw(self):
         self._remove_preview()
+        if self.draw_tool == DrawTool.FREEHAND and self.image_viewer:
+            # End where the mouse was released, even if that last sample was
+            # decimated away
+            last = self._last_raw_world
+            if last is not None and last != self.current_points[-1]:
+                self.current_points.append(last)
+            axes = [a for a in range(3) if a != self.image_viewer.GetSliceOrientation()]
+            self.current_points = kernels.simplify_polyline(
+                np.asarray(self.current_points, dtype=np.float64),
+                0.5 * self._spacing[axes].min(),
+            )
         if len(self.current_points) >= 2 and self.image_viewer:
             self.viewer_widget.finalize_roi(
                 self.draw_tool,
@@ -443,7 +593,7 @@ class DrawingInteractorStyle(vtk.vtkInteractorStyleImage):
         self.is_drawing = False
         self.current_points = []
         self.anchor_point = None
-        self._render()
+        self.viewer_widget.request_render()
 
     def _cancel_drawing(self):
         self._remove_preview()
@@ -451,6 +601,5 @@ class DrawingInteractorStyle(vtk.vtkInteractorStyleImage):
         self.current_points = []
         self.anchor_point = None
         self.draw_tool = DrawTool.NONE
-        self._update_status()
-        self._render()
+        self.viewer_widget.request_render()
         self.viewer_widget.drawing_cancelled.emit()
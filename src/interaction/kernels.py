@@ -0,0 +1,78 @@
+import numpy as np
+
+
+# ===========================================================================
+# Hit-testing kernels (display space)
+# ===========================================================================
+#
+# All kernels take display-space coordinates: a cursor position (mx, my) and
+# an (N, 2) float64 array of projected ROI vertices. They return
+# ``(best_idx, best_d)`` with ``best_idx`` set to None when nothing lies
+# within ``thr`` pixels. Comparisons are done on squared distances; the
+# square root is only taken for the single returned ``best_d``.
+
+
+def seg_dist_sq(px, py, a, b):
+    """Squared distance from (px, py) to every segment a[i] -> b[i]."""
+    ab = b - a
+    ap = np.array([px, py]) - a
+    l2 = np.einsum("ij,ij->i", ab, ab)
+    degenerate = l2 < 1e-12
+    t = np.einsum("ij,ij->i", ap, ab) / np.where(degenerate, 1.0, l2)
+    t = np.where(degenerate, 0.0, np.clip(t, 0.0, 1.0))
+    r = ap - t[:, None] * ab
+    return np.einsum("ij,ij->i", r, r)
+
+
+def _best(d2, thr):
+    if not len(d2):
+        return None, float("inf")
+    i = int(np.argmin(d2))
+    if d2[i] < thr * thr:
+        return i, float(np.sqrt(d2[i]))
+    return None, float("inf")
+
+
+def nearest_vertex(mx, my, pts2d, thr):
+    r = pts2d - np.array([mx, my])
+    return _best(np.einsum("ij,ij->i", r, r), thr)
+
+
+def nearest_edge(mx, my, pts2d, thr):
+    """Edges of the closed polygon: edge i runs from vertex i to i + 1."""
+    return _best(seg_dist_sq(mx, my, pts2d, np.roll(pts2d, -1, axis=0)), thr)
+
+
+# ===========================================================================
+# Polyline simplification (world space)
+# ===========================================================================
+
+
+def simplify_polyline(pts, tol):
+    """Douglas-Peucker simplification of an (N, 3) polyline. Endpoints are
+    always kept; interior vertices within ``tol`` of the chord are dropped."""
+    n = len(pts)
+    if n < 3:
+        return pts
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    tol2 = tol * tol
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j - i < 2:
+            continue
+        ab = pts[j] - pts[i]
+        ap = pts[i + 1 : j] - pts[i]
+        l2 = ab @ ab
+        if l2 > 1e-12:
+            t = np.clip(ap @ ab / l2, 0.0, 1.0)
+            ap = ap - t[:, None] * ab
+        d2 = np.einsum("ij,ij->i", ap, ap)
+        k = int(np.argmax(d2))
+        if d2[k] > tol2:
+            m = i + 1 + k
+            keep[m] = True
+            stack.append((i, m))
+            stack.append((m, j))
+    return pts[keep]
@@ -1,7 +1,6 @@
 from pathlib import Path
 from PyQt6.QtWidgets import (
     QMainWindow,
-    QFileDialog,
     QToolBar,
     QTabWidget,
     QComboBox,
@@ -9,8 +8,8 @@ from PyQt6.QtWidgets import (
     QProgressBar,
 )
 from PyQt6.QtGui import QAction
-from PyQt6.QtCore import QSize, Qt
-from src.widgets import DicomViewerWidget, LesionViewerWidget
+from PyQt6.QtCore import QSize, Qt, QThreadPool, QTimer
+from src.widgets import DicomViewerWidget, LesionViewerWidget, pick_folder
 from src.docks import DicomDetailsDock, LesionLibraryDock, ROIToolsDock
 from src.models import SettingsManager, SETTINGS_FILE
 
@@ -33,9 +32,8 @@ class MainWindow(QMainWindow):
         self.tabs.tabBar().setVisible(False)
         self.setCentralWidget(self.tabs)
 
-        # Tab 1: Lesion 3-D viewer
-        self.lesion_viewer = LesionViewerWidget(parent=self)
-        self.tabs.addTab(self.lesion_viewer, "Lesion Library")
+        # Tab 1: Lesion 3-D viewer – created on first use, see lesion_viewer
+        self._lesion_viewer: LesionViewerWidget | None = None
 
         # Tab 2: DICOM viewer
         self.viewer = DicomViewerWidget(parent=self)
@@ -49,7 +47,7 @@ class MainWindow(QMainWindow):
 
         self.lesion_dock = LesionLibraryDock(self)
         self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.lesion_dock)
-        self.lesion_dock.bind_lesion_viewer(self.lesion_viewer)
+        self.lesion_dock.visibilityChanged.connect(self._on_lesion_dock_visibility)
         self.lesion_dock.hide()
 
         self.dicom_dock = DicomDetailsDock(self)
@@ -59,22 +57,50 @@ class MainWindow(QMainWindow):
         # Wire DICOM spacing -> lesion dock
         self.viewer.dicom_spacing_changed.connect(self.lesion_dock.set_dicom_spacing)
 
+        # Module name -> (tab attribute, dock to show, dock to hide). Tabs are
+        # looked up by name since the lesion viewer is created lazily.
+        self._modules = {
+            "DICOM Viewer": ("viewer", self.roi_dock, self.lesion_dock),
+            "Lesion Library": ("lesion_viewer", self.lesion_dock, self.roi_dock),
+        }
+
+        # ROI data from settings, held until the restored series finish loading
+        self._pending_rois = None
+
         self._build_ui()
         self._restore_settings()
         self.setWindowTitle(self.title)
         self.show()
-        self._switch_module(self.current_module)
-
-    def _switch_module(self, module_name):
+        self._switch_module(self.current_module, force=True)
+
+    @property
+    def lesion_viewer(self) -> LesionViewerWidget:
+        return self._ensure_lesion_viewer()
+
+    def _ensure_lesion_viewer(self) -> LesionViewerWidget:
+        """Create the lesion viewer tab (and its VTK window) on first use."""
+        if self._lesion_viewer is None:
+            self._lesion_viewer = LesionViewerWidget(parent=self)
+            self.tabs.insertTab(0, self._lesion_viewer, "Lesion Library")
+            self.lesion_dock.bind_lesion_viewer(self._lesion_viewer)
+        return self._lesion_viewer
+
+    def _on_lesion_dock_visibility(self, visible: bool):
+        # The dock loads models into the viewer, so it must exist once shown
+        if visible:
+            self._ensure_lesion_viewer()
+
+    def _switch_module(self, module_name, force=False):
+        if module_name == self.current_module and not force:
+            return
+        entry = self._modules.get(module_name)
+        if entry is None:
+            return
+        tab_attr, show_dock, hide_dock = entry
         self.current_module = module_name
-        if module_name == "DICOM Viewer":
-            self.tabs.setCurrentWidget(self.viewer)
-            self.lesion_dock.hide()
-            self.roi_dock.show()
-        elif module_name == "Lesion Library":
-            self.tabs.setCurrentWidget(self.lesion_viewer)
-            self.roi_dock.hide()
-            self.lesion_dock.show()
+        self.tabs.setCurrentWidget(getattr(self, tab_attr))
+        hide_dock.hide()
+        show_dock.show()
 
     def _build_ui(self):
         mb = self.menuBar()
@@ -124,29 +150,24 @@ class MainWindow(QMainWindow):
         if file_m is not None:
             file_m.addAction(act_exit)
 
-        act_details = QAction("DICOM &Details", self)
-        act_details.setShortcut("Ctrl+I")
-        act_details.triggered.connect(
-            lambda: self.dicom_dock.setVisible(not self.dicom_dock.isVisible())
-        )
-        if view_m is not None:
-            view_m.addAction(act_details)
-
-        act_roi = QAction("&ROI Tools", self)
-        act_roi.setShortcut("Ctrl+R")
-        act_roi.triggered.connect(
-            lambda: self.roi_dock.setVisible(not self.roi_dock.isVisible())
-        )
-        if view_m is not None:
-            view_m.addAction(act_roi)
-
-        act_lesion = QAction("&Lesion Library", self)
-        act_lesion.setShortcut("Ctrl+L")
-        act_lesion.triggered.connect(
-            lambda: self.lesion_dock.setVisible(not self.lesion_dock.isVisible())
-        )
-        if view_m is not None:
-            view_m.addAction(act_lesion)
+        shortcut_actions = [act_open, act_add_series, act_save, act_exit]
+
+        # Dock toggles use the docks' own view actions
+        for dock, text, shortcut in (
+            (self.dicom_dock, "DICOM &Details", "Ctrl+I"),
+            (self.roi_dock, "&ROI Tools", "Ctrl+R"),
+            (self.lesion_dock, "&Lesion Library", "Ctrl+L"),
+        ):
+            act = dock.toggleViewAction()
+            act.setText(text)
+            act.setShortcut(shortcut)
+            shortcut_actions.append(act)
+            if view_m is not None:
+                view_m.addAction(act)
+
+        # Holding a shortcut must not open dialogs or toggle docks repeatedly
+        for act in shortcut_actions:
+            act.setAutoRepeat(False)
 
         tb = QToolBar("Main")
         tb.setIconSize(QSize(16, 16))
@@ -168,6 +189,15 @@ class MainWindow(QMainWindow):
             self.status_bar.addPermanentWidget(self._progress_bar)
             self.status_bar.showMessage("Ready", 5000)
 
+        # Progress is repainted at most ~30 times a second
+        self._pending_pct = 0
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setSingleShot(True)
+        self._progress_timer.setInterval(33)
+        self._progress_timer.timeout.connect(
+            lambda: self._progress_bar.setValue(self._pending_pct)
+        )
+
         # Connect DicomViewerWidget loading signals → progress bar
         self.viewer.loading_started.connect(self._on_loading_started)
         self.viewer.loading_progress.connect(self._on_loading_progress)
@@ -178,26 +208,37 @@ class MainWindow(QMainWindow):
     def _on_loading_started(self, message: str):
         if self.status_bar:
             self.status_bar.showMessage(message)
+        self._progress_timer.stop()
+        self._pending_pct = 0
         self._progress_bar.setValue(0)
         self._progress_bar.show()
 
     def _on_loading_progress(self, percent: int):
-        self._progress_bar.setValue(percent)
+        if percent == self._pending_pct:
+            return
+        self._pending_pct = percent
+        if not self._progress_timer.isActive():
+            self._progress_timer.start()
 
     def _on_loading_finished(self):
+        self._progress_timer.stop()
         self._progress_bar.setValue(100)
         self._progress_bar.hide()
         if self.status_bar:
             self.status_bar.showMessage("Ready", 3000)
+        if self.viewer.is_loading:
+            return
+        # Also reached when every restored load failed: the ROIs then wait
+        # detached in the manager until a series builds the pipeline
+        if self._pending_rois is not None:
+            self._restore_pending_rois()
+        self.viewer.resume_render()
 
     # ---- DICOM loading ----
 
     def _open_dicom(self):
         """Load a new scan – replaces all existing series."""
-        folder = QFileDialog.getExistingDirectory(self, "Select DICOM Series Folder")
-        if not folder:
-            return
-        self._load_dicom(folder)
+        pick_folder(self, "Select DICOM Series Folder", self._load_dicom)
 
     def _add_series(self):
         """Add an additional series from the same (or compatible) scan."""
@@ -205,11 +246,11 @@ class MainWindow(QMainWindow):
             # Nothing loaded yet – treat as a fresh open
             self._open_dicom()
             return
-        folder = QFileDialog.getExistingDirectory(
-            self, "Select Additional DICOM Series Folder"
+        pick_folder(
+            self, "Select Additional DICOM Series Folder", self._add_series_folder
         )
-        if not folder:
-            return
+
+    def _add_series_folder(self, folder: str):
         self.viewer.add_series(folder)
         # Update the details dock to show the newly active series
         self.dicom_dock.populate_from_folder(folder)
@@ -219,9 +260,7 @@ class MainWindow(QMainWindow):
     def _load_dicom(self, folder: str):
         """Reset viewer to a single new series."""
         self.viewer.load_dicom(folder)
-        self.lesion_dock.set_dicom_spacing(self.viewer.dicom_spacing)
         self.tabs.setCurrentWidget(self.viewer)
-        self.roi_dock.bind_viewer(self.viewer)
         self.dicom_dock.populate_from_folder(folder)
         if self.status_bar:
             self.status_bar.showMessage(f"Loaded: {folder}", 5000)
@@ -229,6 +268,13 @@ class MainWindow(QMainWindow):
     # ---- Settings persistence ----
 
     def _save_settings(self):
+        self._collect_settings()
+        self.settings.save()
+        if self.status_bar:
+            self.status_bar.showMessage(f"Settings saved to {SETTINGS_FILE}", 5000)
+
+    def _collect_settings(self):
+        """Copy the current UI state into the settings (GUI thread only)."""
         s = self.settings
         s.set("last_dicom_folders", self.viewer.loaded_folders)
         # Keep legacy key in sync with the first/active folder for older readers
@@ -236,10 +282,10 @@ class MainWindow(QMainWindow):
         s.set("lesion_library_dir", self.lesion_dock._library_dir or "")
         s.set("custom_spacing", self.lesion_dock.get_custom_spacing())
         s.set("use_dicom_spacing", self.lesion_dock.use_dicom_cb.isChecked())
-        s.set("rois", SettingsManager.serialise_rois(self.viewer.roi_manager.rois))
-        s.save()
-        if self.status_bar:
-            self.status_bar.showMessage(f"Settings saved to {SETTINGS_FILE}", 5000)
+        # Until the restored ROIs reach the manager, the stored list is the
+        # only copy of them; leave it as loaded
+        if self._pending_rois is None:
+            s.set("rois", SettingsManager.serialise_rois(self.viewer.roi_manager.rois))
 
     def _restore_settings(self):
         s = self.settings
@@ -258,7 +304,8 @@ class MainWindow(QMainWindow):
             if legacy:
                 folders = [legacy]
 
-        # Load first valid folder as primary series, add the rest
+        # Load first valid folder as primary series, add the rest. The
+        # viewer renders once the whole batch has loaded, not per series.
         loaded_first = False
         for folder in folders:
             if not Path(folder).is_dir():
@@ -270,22 +317,25 @@ class MainWindow(QMainWindow):
                 self.viewer.add_series(folder)
 
         if loaded_first:
-            # Restore ROIs (shared across all series)
-            roi_data = SettingsManager.deserialise_rois(s.get("rois") or [])
-            ren = (
-                self.viewer.image_viewer.GetRenderer()
-                if self.viewer.image_viewer
-                else None
-            )
-            for rd in roi_data:
-                self.viewer.roi_manager.add_roi(renderer=ren, **rd)
-            if self.viewer.image_viewer:
-                style = self.viewer.interactor_style
-                if style:
-                    self.viewer.roi_manager.update_visibility(
-                        style.slice, self.viewer.image_viewer.GetSliceOrientation()
-                    )
-                self.viewer.image_viewer.Render()
+            self.viewer.suspend_render()
+            # ROIs (shared across all series) need the renderer, which only
+            # exists once the background loads have finished
+            self._pending_rois = SettingsManager.deserialise_rois(s.get("rois") or [])
+
+    def _restore_pending_rois(self):
+        roi_data, self._pending_rois = self._pending_rois, None
+        mgr = self.viewer.roi_manager
+        # Build everything detached, then attach, cull and render once
+        for rd in roi_data:
+            mgr.add_roi(renderer=None, **rd)
+        if self.viewer.image_viewer:
+            mgr.attach_all(self.viewer.image_viewer.GetRenderer())
+            style = self.viewer.interactor_style
+            if style:
+                mgr.update_visibility(
+                    style.slice, self.viewer.image_viewer.GetSliceOrientation()
+                )
+            self.viewer.request_render()
 
     def _load_settings_action(self):
         self.settings.load()
@@ -294,7 +344,13 @@ class MainWindow(QMainWindow):
             self.status_bar.showMessage("Settings reloaded", 5000)
 
     def closeEvent(self, a0):
-        self._save_settings()
+        # Snapshot on the GUI thread, then overlap the file write with VTK
+        # teardown; the write must finish before the window goes away
+        self._collect_settings()
+        pool = QThreadPool.globalInstance()
+        pool.start(self.settings.save)
         self.viewer.cleanup()
-        self.lesion_viewer.cleanup()
+        if self._lesion_viewer is not None:
+            self._lesion_viewer.cleanup()
+        pool.waitForDone()
         super().closeEvent(a0)
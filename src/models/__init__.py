@@ -1,5 +1,22 @@
+from src.models.dicom_series import (
+    SeriesEntry,
+    flush_header_cache,
+    freeze_meta,
+    read_series_meta,
+    scan_series_headers,
+)
 from src.models.draw_tool import DrawTool
 from src.models.roi_manager import ROIManager
 from src.models.settings_manager import SettingsManager, SETTINGS_FILE
 
-__all__ = ["DrawTool", "ROIManager", "SettingsManager", "SETTINGS_FILE"]
+__all__ = [
+    "DrawTool",
+    "ROIManager",
+    "SettingsManager",
+    "SETTINGS_FILE",
+    "SeriesEntry",
+    "flush_header_cache",
+    "freeze_meta",
+    "read_series_meta",
+    "scan_series_headers",
+]
@@ -0,0 +1,256 @@
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+import numpy as np
+import pydicom
+from src.models.json_io import dumps, loads, write_bytes
+
+# ===========================================================================
+# Loaded series
+# ===========================================================================
+
+
+@dataclass(slots=True)
+class SeriesEntry:
+    """One loaded series: its VTK pipeline and the metadata the viewer shows."""
+
+    folder: str
+    reader: object  # vtkDICOMImageReader
+    output: object  # last pipeline stage: vtkImageReslice, or the reader
+    spacing: list
+    meta: object  # display tags (pydicom Dataset) or None
+    num_slices: int
+    headers: dict  # scan_series_headers() result
+    label: str = ""
+
+
+# ===========================================================================
+# Series header scan
+# ===========================================================================
+
+# Only the elements needed for geometry and identity; PixelData is never read
+HEADER_TAGS = [
+    "ImagePositionPatient",
+    "ImageOrientationPatient",
+    "PixelSpacing",
+    "SliceThickness",
+    "SeriesInstanceUID",
+]
+
+FOLDER_CACHE_FILE = Path.home() / ".dicom_viewer_folder_cache.json"
+
+
+class FolderMetaCache:
+    """On-disk cache of series header scans, keyed by folder path.
+
+    An entry is only returned while the folder's signature (see
+    _folder_signature) still matches the one it was stored with. Entries
+    are written out by flush(), not on every set().
+    """
+
+    MAX_ENTRIES = 64
+
+    def __init__(self, path: Path = FOLDER_CACHE_FILE):
+        self._path = path
+        self._data: dict | None = None
+        self._dirty = False
+
+    def _entries(self) -> dict:
+        if self._data is None:
+            self._data = {}
+            if self._path.exists():
+                try:
+                    self._data = loads(self._path.read_bytes())
+                except Exception:
+                    pass
+        return self._data
+
+    def get(self, folder: str, signature: list) -> dict | None:
+        entry = self._entries().get(folder)
+        if entry is None or entry.get("signature") != signature:
+            return None
+        return entry["meta"]
+
+    def set(self, folder: str, signature: list, meta: dict):
+        entries = self._entries()
+        entries.pop(folder, None)
+        entries[folder] = {"signature": signature, "meta": meta}
+        while len(entries) > self.MAX_ENTRIES:
+            del entries[next(iter(entries))]
+        self._dirty = True
+
+    def flush(self):
+        if not self._dirty:
+            return
+        try:
+            write_bytes(self._path, dumps(self._entries()))
+            self._dirty = False
+        except Exception as e:
+            print(f"Warning: could not save folder cache: {e}")
+
+
+# folder -> (signature, scan result), most recently used last; backed by the
+# on-disk cache across runs
+_HEADER_CACHE: dict[str, tuple[list, dict]] = {}
+_HEADER_CACHE_MAX = 32
+_DISK_CACHE = FolderMetaCache()
+
+
+def _remember_scan(folder: str, signature: list, result: dict):
+    # One entry per folder; the least recently used folders are dropped
+    _HEADER_CACHE.pop(folder, None)
+    _HEADER_CACHE[folder] = (signature, result)
+    while len(_HEADER_CACHE) > _HEADER_CACHE_MAX:
+        del _HEADER_CACHE[next(iter(_HEADER_CACHE))]
+
+
+def flush_header_cache():
+    """Write header scans made since the last flush to the on-disk cache.
+    Call it while no scan is running, e.g. once the load queue is empty."""
+    _DISK_CACHE.flush()
+
+
+def series_files(folder: str) -> list[str]:
+    """Non-hidden regular files in *folder*, sorted by name."""
+    return _list_series(folder)[0]
+
+
+def _list_series(folder: str) -> tuple[list[str], int]:
+    """series_files() plus the newest modification time among them."""
+    files = []
+    newest = 0
+    with os.scandir(folder) as it:
+        for e in it:
+            if not e.name.startswith(".") and e.is_file():
+                files.append(e.path)
+                newest = max(newest, e.stat().st_mtime_ns)
+    files.sort()
+    return files, newest
+
+
+def _folder_signature(folder: str, files: list[str], newest: int) -> list:
+    # The directory mtime catches added, removed and renamed slices; the
+    # newest file mtime catches a slice overwritten in place
+    return [os.stat(folder).st_mtime_ns, newest, len(files)]
+
+
+def _read_header(path: str):
+    try:
+        return pydicom.dcmread(path, stop_before_pixels=True, specific_tags=HEADER_TAGS)
+    except Exception:
+        return None
+
+
+def scan_series_headers(folder: str) -> dict:
+    """Parse the geometry headers of every file in *folder* in parallel.
+
+    Returns a dict with ``files`` (readable slices, ordered along the slice
+    normal), ``num_files``, ``spacing`` ([sx, sy, sz], matching what
+    vtkDICOMImageReader reports), ``orientation`` and ``series_uid``.
+    Results are cached in memory and on disk per folder, until a slice is
+    added, removed or modified.
+    """
+    files, newest = _list_series(folder)
+    signature = _folder_signature(folder, files, newest)
+    cached = _HEADER_CACHE.get(folder)
+    if cached is not None and cached[0] == signature:
+        _remember_scan(folder, signature, cached[1])
+        return cached[1]
+
+    hit = _DISK_CACHE.get(folder, signature)
+    if hit is not None:
+        _remember_scan(folder, signature, hit)
+        return hit
+
+    with ThreadPoolExecutor(max_workers=min(16, os.cpu_count() or 1)) as pool:
+        headers = list(pool.map(_read_header, files))
+    pairs = [(f, ds) for f, ds in zip(files, headers) if ds is not None]
+
+    spacing = [1.0, 1.0, 1.0]
+    orientation = None
+    series_uid = None
+    if pairs:
+        ds = pairs[0][1]
+        ps = getattr(ds, "PixelSpacing", None)
+        if ps is not None and len(ps) == 2:
+            # PixelSpacing is (row, column); x runs along a row
+            spacing[0], spacing[1] = float(ps[1]), float(ps[0])
+        thickness = getattr(ds, "SliceThickness", None)
+        if thickness:
+            spacing[2] = float(thickness)
+        series_uid = str(getattr(ds, "SeriesInstanceUID", "")) or None
+
+        iop = getattr(ds, "ImageOrientationPatient", None)
+        ipp = [getattr(d, "ImagePositionPatient", None) for _, d in pairs]
+        if iop is not None and len(iop) == 6 and all(p is not None for p in ipp):
+            orientation = [float(v) for v in iop]
+            normal = np.cross(orientation[:3], orientation[3:])
+            z = np.asarray(ipp, dtype=float) @ normal
+            order = np.argsort(z, kind="stable")
+            pairs = [pairs[i] for i in order]
+            steps = np.diff(z[order])
+            if len(steps) and np.median(steps) > 0:
+                # Slice step from positions, as the VTK reader computes it
+                spacing[2] = float(np.median(steps))
+
+    result = {
+        "files": [f for f, _ in pairs],
+        "num_files": len(files),
+        # Rounded through float32, the precision VTK stores spacing in
+        "spacing": [np.float32(v).item() for v in spacing],
+        "orientation": orientation,
+        "series_uid": series_uid,
+    }
+    _remember_scan(folder, signature, result)
+    _DISK_CACHE.set(folder, signature, result)
+    return result
+
+
+# ===========================================================================
+# Display metadata
+# ===========================================================================
+
+# Everything the viewer's overlays, series label and default W/L read
+META_TAGS = [
+    "PatientName",
+    "PatientID",
+    "PatientBirthDate",
+    "PatientSex",
+    "StudyDate",
+    "StudyDescription",
+    "SeriesDescription",
+    "SeriesNumber",
+    "Modality",
+    "InstitutionName",
+    "WindowWidth",
+    "WindowCenter",
+    "Rows",
+    "Columns",
+    "PixelSpacing",
+    "SliceLocation",
+    "SliceThickness",
+]
+
+
+@functools.lru_cache(maxsize=32)
+def _read_meta(path: str, mtime_ns: int):
+    return pydicom.dcmread(path, stop_before_pixels=True, specific_tags=META_TAGS)
+
+
+def freeze_meta(ds) -> dict:
+    """Plain ``{keyword: value}`` copy of the META_TAGS in *ds*; missing
+    elements map to None. Lookups on it skip pydicom's attribute machinery."""
+    if ds is None:
+        return {}
+    return {kw: getattr(ds, kw, None) for kw in META_TAGS}
+
+
+def read_series_meta(path: str):
+    """Display metadata from one slice, or None if it cannot be read. Cached
+    until the file changes; callers must not modify the returned dataset."""
+    try:
+        return _read_meta(path, os.stat(path).st_mtime_ns)
+    except Exception:
+        return None
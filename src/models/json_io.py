@@ -0,0 +1,32 @@
+from pathlib import Path
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # optional: faster serialisation when available
+    orjson = None
+
+
+# ===========================================================================
+# JSON file helpers
+# ===========================================================================
+
+
+def loads(raw: bytes):
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def dumps(obj) -> bytes:
+    # Compact output: indenting put every ROI coordinate on its own line
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def write_bytes(path: Path, data: bytes):
+    # Write to a sibling temp file and swap it in, so a crash mid-write
+    # never leaves a truncated file behind
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
@@ -1,12 +1,14 @@
 from dataclasses import dataclass, field
 from typing import Optional
+import numpy as np
 from PyQt6.QtCore import pyqtSignal, QObject
 from vtkmodules.vtkRenderingCore import (
     vtkActor,
     vtkPolyDataMapper,
 )
 from vtkmodules.vtkCommonDataModel import vtkPolyData, vtkCellArray
-from vtkmodules.vtkCommonCore import vtkPoints, vtkIdList
+from vtkmodules.vtkCommonCore import vtkPoints
+from vtkmodules.util.numpy_support import numpy_to_vtk, numpy_to_vtkIdTypeArray
 
 
 # ===========================================================================
@@ -32,15 +34,73 @@ class ROI:
     roi_type: str
     slice_index: int
     orientation: int
-    points: list
+    points: np.ndarray = field(compare=False)
     color: tuple = (1, 0, 0)
     actor: Optional[vtkActor] = field(default=None, repr=False)
     handles_actor: Optional[vtkActor] = field(default=None, repr=False)
+    # Bumped on every geometry edit; keys derived caches such as the
+    # display-space projection kept by the interactor style
+    version: int = field(default=0, init=False, compare=False)
+    _disp_key: Optional[tuple] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _disp_pts: Optional[np.ndarray] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _disp_bbox: Optional[tuple] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        self.points = np.array(self.points, dtype=np.float64).reshape(-1, 3)
+
+
+# Connectivity arrays by vertex count; ROIs are edited at a handful of sizes
+# (4-point rectangles, fixed-segment ellipses), so these are almost always hits
+_CONN_CACHE: dict[tuple, tuple] = {}
+
+
+def _cell_arrays(n, kind):
+    arrays = _CONN_CACHE.get((n, kind))
+    if arrays is None:
+        if kind == "closed":
+            conn = np.empty(n + 1, dtype=np.int64)
+            conn[:n] = np.arange(n)
+            conn[n] = 0
+            offsets = np.array([0, n + 1], dtype=np.int64)
+        elif kind == "open":
+            conn = np.arange(n, dtype=np.int64)
+            offsets = np.array([0, n], dtype=np.int64)
+        else:  # one vertex cell per point
+            conn = np.arange(n, dtype=np.int64)
+            offsets = np.arange(n + 1, dtype=np.int64)
+        arrays = _CONN_CACHE[(n, kind)] = (offsets, conn)
+    return arrays
+
+
+def _cells_from(offsets, conn) -> vtkCellArray:
+    cells = vtkCellArray()
+    cells.SetData(numpy_to_vtkIdTypeArray(offsets), numpy_to_vtkIdTypeArray(conn))
+    return cells
+
+
+def polyline_cells(n, closed=True) -> vtkCellArray:
+    """Single polyline cell over points 0..n-1."""
+    return _cells_from(*_cell_arrays(n, "closed" if closed else "open"))
+
+
+def vertex_cells(n) -> vtkCellArray:
+    """One vertex cell per point 0..n-1."""
+    return _cells_from(*_cell_arrays(n, "verts"))
 
 
 class ROIManager(QObject):
     roi_added = pyqtSignal(object)
     roi_removed = pyqtSignal(int)
+    roi_renamed = pyqtSignal(int)
+    # Vertex moves/inserts/deletes and translation of a single ROI
+    geometry_changed = pyqtSignal(int)
+    # Bulk change (clear); single-ROI changes use the signals above
     rois_changed = pyqtSignal()
     selection_changed = pyqtSignal(object)
 
@@ -50,6 +110,13 @@ class ROIManager(QObject):
         self._next_id = 1
         self._color_idx = 0
         self._selected_id: Optional[int] = None
+        # (slice, orientation) -> (ids, bbox_min, bbox_max); rebuilt lazily
+        self._slice_index: Optional[dict] = None
+        # ROI ids shown by the last update_visibility; None forces a full pass
+        self._visible_ids: Optional[set] = None
+        # Actors detached from the renderer, recycled by add_roi/select
+        self._free_actors: list[vtkActor] = []
+        self._free_handles: list[vtkActor] = []
 
     @property
     def rois(self):
@@ -88,16 +155,17 @@ class ROIManager(QObject):
             roi_type=roi_type,
             slice_index=slice_index,
             orientation=orientation,
-            points=list(points),
+            points=points,
             color=color,
         )
         self._next_id += 1
-        roi.actor = self._build_contour_actor(roi)
+        roi.actor = self._acquire_contour_actor(roi)
         if renderer:
             renderer.AddActor(roi.actor)
         self._rois[roi.roi_id] = roi
+        self._slice_index = None
+        self._visible_ids = None
         self.roi_added.emit(roi)
-        self.rois_changed.emit()
         return roi
 
     def remove_roi(self, roi_id, renderer=None):
@@ -106,29 +174,34 @@ class ROIManager(QObject):
         roi = self._rois.pop(roi_id, None)
         if roi is None:
             return
+        self._slice_index = None
+        self._visible_ids = None
         if renderer:
-            if roi.actor:
-                renderer.RemoveActor(roi.actor)
-            if roi.handles_actor:
-                renderer.RemoveActor(roi.handles_actor)
+            self._release_actors(roi, renderer)
         self.roi_removed.emit(roi_id)
-        self.rois_changed.emit()
 
     def clear(self, renderer=None):
         self.select(None, renderer)
-        for roi in list(self._rois.values()):
-            if renderer:
-                if roi.actor:
-                    renderer.RemoveActor(roi.actor)
-                if roi.handles_actor:
-                    renderer.RemoveActor(roi.handles_actor)
+        if renderer:
+            for roi in self._rois.values():
+                self._release_actors(roi, renderer)
         self._rois.clear()
+        self._slice_index = None
+        self._visible_ids = None
         self.rois_changed.emit()
 
+    def attach_all(self, renderer):
+        """Add every contour actor to *renderer* in one pass; used after bulk
+        add_roi(renderer=None) calls. Already-attached actors are skipped by
+        vtkRenderer itself."""
+        for roi in self._rois.values():
+            if roi.actor:
+                renderer.AddActor(roi.actor)
+
     def rename_roi(self, roi_id, new_name):
         if roi_id in self._rois:
             self._rois[roi_id].name = new_name
-            self.rois_changed.emit()
+            self.roi_renamed.emit(roi_id)
 
     def select(self, roi_id, renderer=None):
         prev = (
@@ -139,13 +212,14 @@ class ROIManager(QObject):
                 prev.actor.GetProperty().SetLineWidth(2.0)
             if prev.handles_actor and renderer:
                 renderer.RemoveActor(prev.handles_actor)
+                self._free_handles.append(prev.handles_actor)
                 prev.handles_actor = None
         self._selected_id = roi_id
         cur = self._rois.get(roi_id)
         if cur:
             if cur.actor:
                 cur.actor.GetProperty().SetLineWidth(3.5)
-            cur.handles_actor = self._build_handles_actor(cur)
+            cur.handles_actor = self._acquire_handles_actor(cur)
             if renderer:
                 renderer.AddActor(cur.handles_actor)
         self.selection_changed.emit(roi_id)
@@ -161,16 +235,15 @@ class ROIManager(QObject):
         roi = self._rois.get(roi_id)
         if not roi:
             return
-        roi.points = [(p[0] + dx, p[1] + dy, p[2] + dz) for p in roi.points]
+        roi.points += (dx, dy, dz)
         self._rebuild_visuals(roi, renderer)
 
     def insert_vertex(self, roi_id, edge_idx, world_pt, renderer=None):
         roi = self._rois.get(roi_id)
         if not roi:
             return
-        roi.points.insert(edge_idx + 1, world_pt)
+        roi.points = np.insert(roi.points, edge_idx + 1, world_pt, axis=0)
         self._rebuild_visuals(roi, renderer)
-        self.rois_changed.emit()
 
     def delete_vertex(self, roi_id, vertex_idx, renderer=None):
         roi = self._rois.get(roi_id)
@@ -178,37 +251,140 @@ class ROIManager(QObject):
             return False
         if vertex_idx < 0 or vertex_idx >= len(roi.points):
             return False
-        roi.points.pop(vertex_idx)
+        roi.points = np.delete(roi.points, vertex_idx, axis=0)
         self._rebuild_visuals(roi, renderer)
-        self.rois_changed.emit()
         return True
 
     def _rebuild_visuals(self, roi, renderer=None):
-        if renderer and roi.actor:
+        roi.version += 1
+        self._slice_index = None
+        self._visible_ids = None
+        # Existing actors are updated in place; only a missing or empty
+        # contour actor goes through the full build/AddActor path
+        poly = self._actor_poly(roi.actor)
+        if poly is not None and len(roi.points) >= 2:
+            self._set_poly_points(poly, roi.points, polyline_cells, poly.SetLines)
+        else:
+            if renderer and roi.actor:
+                renderer.RemoveActor(roi.actor)
+            roi.actor = self._build_contour_actor(roi)
+            if self._selected_id == roi.roi_id:
+                roi.actor.GetProperty().SetLineWidth(3.5)
+            if renderer:
+                renderer.AddActor(roi.actor)
+        if roi.handles_actor:
+            poly = self._actor_poly(roi.handles_actor)
+            self._set_poly_points(poly, roi.points, vertex_cells, poly.SetVerts)
+        self.geometry_changed.emit(roi.roi_id)
+
+    # ---- Actor pool ----
+
+    def _release_actors(self, roi, renderer):
+        if roi.actor:
             renderer.RemoveActor(roi.actor)
-        roi.actor = self._build_contour_actor(roi)
-        if self._selected_id == roi.roi_id:
-            roi.actor.GetProperty().SetLineWidth(3.5)
-        if renderer:
-            renderer.AddActor(roi.actor)
-        if roi.handles_actor and renderer:
+            if self._actor_poly(roi.actor) is not None:
+                self._free_actors.append(roi.actor)
+        if roi.handles_actor:
             renderer.RemoveActor(roi.handles_actor)
-            roi.handles_actor = None
-        if self._selected_id == roi.roi_id:
-            roi.handles_actor = self._build_handles_actor(roi)
-            if renderer:
-                renderer.AddActor(roi.handles_actor)
+            self._free_handles.append(roi.handles_actor)
+        roi.actor = roi.handles_actor = None
+
+    def _acquire_contour_actor(self, roi):
+        if len(roi.points) < 2 or not self._free_actors:
+            return self._build_contour_actor(roi)
+        actor = self._free_actors.pop()
+        poly = self._actor_poly(actor)
+        poly.GetPoints().SetData(numpy_to_vtk(roi.points))
+        poly.SetLines(polyline_cells(len(roi.points)))
+        poly.Modified()
+        actor.GetProperty().SetColor(*roi.color)
+        actor.GetProperty().SetLineWidth(2.0)
+        actor.SetPosition(*self._plane_offset(roi.orientation, 0.5))
+        actor.SetVisibility(True)
+        return actor
+
+    def _acquire_handles_actor(self, roi):
+        if not self._free_handles:
+            return self._build_handles_actor(roi)
+        actor = self._free_handles.pop()
+        poly = self._actor_poly(actor)
+        poly.GetPoints().SetData(numpy_to_vtk(roi.points))
+        poly.SetVerts(vertex_cells(len(roi.points)))
+        poly.Modified()
+        actor.SetPosition(*self._plane_offset(roi.orientation, 0.6))
+        actor.SetVisibility(True)
+        return actor
+
+    @staticmethod
+    def _plane_offset(orientation, amount):
+        offset = [0.0, 0.0, 0.0]
+        offset[orientation] = amount
+        return offset
+
+    @staticmethod
+    def _actor_poly(actor):
+        mapper = actor.GetMapper() if actor else None
+        return mapper.GetInput() if mapper else None
+
+    @staticmethod
+    def _set_poly_points(poly, points, make_cells, set_cells):
+        """Swap ``poly``'s point data for ``points``; cells are rebuilt only
+        when the vertex count changed."""
+        n_old = poly.GetNumberOfPoints()
+        poly.GetPoints().SetData(numpy_to_vtk(points))
+        if n_old != len(points):
+            set_cells(make_cells(len(points)))
+        poly.Modified()
+
+    def rois_in_bounds(self, slice_index, orientation, lo, hi):
+        """ROIs on the given slice whose in-plane world bbox overlaps the
+        box ``lo``..``hi``. The out-of-plane axis is ignored."""
+        entry = self._get_slice_index().get((slice_index, orientation))
+        if entry is None:
+            return []
+        ids, bmin, bmax = entry
+        axes = [a for a in range(3) if a != orientation]
+        lo, hi = np.asarray(lo)[axes], np.asarray(hi)[axes]
+        hit = np.all((bmin[:, axes] <= hi) & (bmax[:, axes] >= lo), axis=1)
+        return [self._rois[i] for i in ids[hit]]
+
+    def _get_slice_index(self):
+        if self._slice_index is None:
+            groups = {}
+            for roi in self._rois.values():
+                if len(roi.points):
+                    key = (roi.slice_index, roi.orientation)
+                    groups.setdefault(key, []).append(roi)
+            self._slice_index = {}
+            for key, rois in groups.items():
+                self._slice_index[key] = (
+                    np.array([r.roi_id for r in rois]),
+                    np.array([r.points.min(axis=0) for r in rois]),
+                    np.array([r.points.max(axis=0) for r in rois]),
+                )
+        return self._slice_index
 
     def update_visibility(self, current_slice, current_orientation):
-        for roi in self._rois.values():
-            vis = (
-                roi.slice_index == current_slice
-                and roi.orientation == current_orientation
-            )
-            if roi.actor:
-                roi.actor.SetVisibility(vis)
-            if roi.handles_actor:
-                roi.handles_actor.SetVisibility(vis and self._selected_id == roi.roi_id)
+        entry = self._get_slice_index().get((current_slice, current_orientation))
+        shown = set(entry[0].tolist()) if entry is not None else set()
+        # Only ROIs whose visibility flips are touched
+        if self._visible_ids is None:
+            hide, show = self._rois.keys() - shown, shown
+        else:
+            hide, show = self._visible_ids - shown, shown - self._visible_ids
+        for rid in hide:
+            roi = self._rois.get(rid)
+            if roi:
+                self._set_roi_visible(roi, False)
+        for rid in show:
+            self._set_roi_visible(self._rois[rid], True)
+        self._visible_ids = shown
+
+    def _set_roi_visible(self, roi, vis):
+        if roi.actor:
+            roi.actor.SetVisibility(vis)
+        if roi.handles_actor:
+            roi.handles_actor.SetVisibility(vis and self._selected_id == roi.roi_id)
 
     @staticmethod
     def _build_contour_actor(roi):
@@ -216,50 +392,39 @@ class ROIManager(QObject):
         if len(pts) < 2:
             return vtkActor()
         vtk_points = vtkPoints()
-        for p in pts:
-            vtk_points.InsertNextPoint(p)
-        lines = vtkCellArray()
-        ids = vtkIdList()
-        for i in range(len(pts)):
-            ids.InsertNextId(i)
-        ids.InsertNextId(0)
-        lines.InsertNextCell(ids)
+        vtk_points.SetData(numpy_to_vtk(pts))
         poly = vtkPolyData()
         poly.SetPoints(vtk_points)
-        poly.SetLines(lines)
+        poly.SetLines(polyline_cells(len(pts)))
         mapper = vtkPolyDataMapper()
         mapper.SetInputData(poly)
+        # Input is a plain data object; edits mark it modified directly, so
+        # the mapper need not run a pipeline update on every render
+        mapper.SetStatic(True)
         actor = vtkActor()
         actor.SetMapper(mapper)
         actor.GetProperty().SetColor(*roi.color)
         actor.GetProperty().SetLineWidth(2.0)
         actor.GetProperty().SetAmbient(1.0)
         actor.GetProperty().SetDiffuse(0.0)
-        offset = [0.0, 0.0, 0.0]
-        offset[roi.orientation] = 0.5
-        actor.SetPosition(*offset)
+        actor.SetPosition(*ROIManager._plane_offset(roi.orientation, 0.5))
         return actor
 
     @staticmethod
     def _build_handles_actor(roi):
         vtk_points = vtkPoints()
-        verts = vtkCellArray()
-        for p in roi.points:
-            pid = vtk_points.InsertNextPoint(p)
-            verts.InsertNextCell(1)
-            verts.InsertCellPoint(pid)
+        vtk_points.SetData(numpy_to_vtk(roi.points))
         poly = vtkPolyData()
         poly.SetPoints(vtk_points)
-        poly.SetVerts(verts)
+        poly.SetVerts(vertex_cells(len(roi.points)))
         mapper = vtkPolyDataMapper()
         mapper.SetInputData(poly)
+        mapper.SetStatic(True)
         actor = vtkActor()
         actor.SetMapper(mapper)
         actor.GetProperty().SetColor(1.0, 1.0, 1.0)
         actor.GetProperty().SetPointSize(8.0)
         actor.GetProperty().SetAmbient(1.0)
         actor.GetProperty().SetDiffuse(0.0)
-        offset = [0.0, 0.0, 0.0]
-        offset[roi.orientation] = 0.6
-        actor.SetPosition(*offset)
+        actor.SetPosition(*ROIManager._plane_offset(roi.orientation, 0.6))
         return actor
@@ -1,5 +1,6 @@
 from pathlib import Path
-import json
+import numpy as np
+from src.models.json_io import dumps, loads, write_bytes
 
 
 SETTINGS_FILE = Path.home() / ".dicom_viewer_settings.json"
@@ -25,6 +26,7 @@ class SettingsManager:
     def __init__(self, path: Path = SETTINGS_FILE):
         self._path = path
         self._data: dict = dict(self.DEFAULTS)
+        self._saved: bytes | None = None  # file contents as last read/written
         self.load()
 
     # ---- I/O ----
@@ -32,8 +34,9 @@ class SettingsManager:
     def load(self):
         if self._path.exists():
             try:
-                with open(self._path, "r") as f:
-                    stored = json.load(f)
+                raw = self._path.read_bytes()
+                stored = loads(raw)
+                self._saved = raw
                 for k, v in self.DEFAULTS.items():
                     self._data[k] = stored.get(k, v)
                 # Migrate legacy single-folder key to list
@@ -47,8 +50,11 @@ class SettingsManager:
 
     def save(self):
         try:
-            with open(self._path, "w") as f:
-                json.dump(self._data, f, indent=2)
+            data = dumps(self._data)
+            # Nothing changed since the last load/save: skip the disk write
+            if data != self._saved:
+                write_bytes(self._path, data)
+                self._saved = data
         except Exception as e:
             print(f"Warning: could not save settings: {e}")
 
@@ -72,7 +78,7 @@ class SettingsManager:
                     "roi_type": roi.roi_type,
                     "slice_index": roi.slice_index,
                     "orientation": roi.orientation,
-                    "points": [list(p) for p in roi.points],
+                    "points": roi.points.tolist(),
                     "color": list(roi.color),
                 }
             )
@@ -80,15 +86,20 @@ class SettingsManager:
 
     @staticmethod
     def deserialise_rois(data: list) -> list:
+        # Convert every vertex in one pass; each ROI gets its slice of the block
+        flat = np.asarray(
+            [p for d in data for p in d["points"]], dtype=np.float64
+        ).reshape(-1, 3)
+        bounds = np.cumsum([len(d["points"]) for d in data], dtype=np.int64)[:-1]
         out = []
-        for d in data:
+        for d, pts in zip(data, np.split(flat, bounds)):
             out.append(
                 {
                     "name": d["name"],
                     "roi_type": d["roi_type"],
                     "slice_index": d["slice_index"],
                     "orientation": d["orientation"],
-                    "points": [tuple(p) for p in d["points"]],
+                    "points": pts,
                     "color": tuple(d["color"]),
                 }
             )
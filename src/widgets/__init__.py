@@ -1,4 +1,5 @@
 from src.widgets.dicom_viewer import DicomViewerWidget
+from src.widgets.folder_dialog import pick_folder
 from src.widgets.lesion_viewer import LesionViewerWidget
 
-__all__ = ["DicomViewerWidget", "LesionViewerWidget"]
+__all__ = ["DicomViewerWidget", "LesionViewerWidget", "pick_folder"]
@@ -6,11 +6,9 @@ from PyQt6.QtWidgets import (
     QHBoxLayout,
     QComboBox,
     QPushButton,
-    QFileDialog,
     QScrollBar,
-    QApplication,
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal
 from vtkmodules.vtkCommonColor import vtkNamedColors
 from vtkmodules.vtkIOImage import vtkDICOMImageReader
 from vtkmodules.vtkInteractionImage import vtkImageViewer2
@@ -21,12 +19,105 @@ from vtkmodules.vtkRenderingCore import (
 )
 from vtkmodules.vtkImagingCore import vtkImageReslice
 from vtkmodules.vtkCommonCore import vtkCommand
+from vtkmodules.util.numpy_support import vtk_to_numpy
 from vtkmodules.qt.QVTKRenderWindowInteractor import QVTKRenderWindowInteractor
 from src.models import ROIManager
 from src.models import DrawTool
+from src.models import (
+    SeriesEntry,
+    flush_header_cache,
+    freeze_meta,
+    read_series_meta,
+    scan_series_headers,
+)
 from src.interaction.drawing_interactor_style import DrawingInteractorStyle
-import vtkmodules.all as vtk
-import pydicom
+from src.widgets.folder_dialog import pick_folder
+
+
+# ===========================================================================
+# Background series loader
+# ===========================================================================
+
+
+class SeriesLoader(QThread):
+    """Reads one DICOM folder and reslices it off the GUI thread.
+
+    ``loaded`` carries a SeriesEntry (without its display label); the
+    viewer wires it into the pipeline once the thread has finished.
+    """
+
+    progress = pyqtSignal(int)  # 0-100
+    loaded = pyqtSignal(object)  # SeriesEntry
+    spacing_ready = pyqtSignal(list)  # [sx, sy, sz] from the header scan
+    failed = pyqtSignal(str)
+
+    def __init__(self, folder: str, view_orientation: str, parent=None):
+        super().__init__(parent)
+        self.folder = folder
+        self.view_orientation = view_orientation
+
+    def run(self):
+        try:
+            self.loaded.emit(self._read())
+        except Exception as e:
+            self.failed.emit(str(e))
+
+    def _read(self) -> SeriesEntry:
+        folder = self.folder
+
+        # --- Parallel header scan (0% → 10%) ---
+        headers = scan_series_headers(folder)
+        self.spacing_ready.emit(headers["spacing"])
+        self.progress.emit(10)
+
+        meta = read_series_meta(headers["files"][0]) if headers["files"] else None
+
+        # --- VTK DICOM reader (10% → 70%) ---
+        reader = vtkDICOMImageReader()
+        reader.SetDirectoryName(folder)
+
+        def _on_reader_progress(obj, _event):
+            self.progress.emit(10 + int(obj.GetProgress() * 60))
+
+        reader_tag = reader.AddObserver("ProgressEvent", _on_reader_progress)
+        reader.Update()
+        reader.RemoveObserver(reader_tag)
+
+        self.progress.emit(70)
+
+        spacing = list(reader.GetOutput().GetSpacing())
+
+        # --- Reslice (70% → 95%) ---
+        # Axial is the reader's native layout; an identity reslice would only
+        # copy every voxel, so the reader feeds the viewer directly
+        output = reader
+        if self.view_orientation in ("coronal", "sagittal"):
+            output = vtkImageReslice()
+            output.SetInputConnection(reader.GetOutputPort())
+            if self.view_orientation == "coronal":
+                output.SetResliceAxesDirectionCosines(1, 0, 0, 0, 0, 1, 0, -1, 0)
+            else:
+                output.SetResliceAxesDirectionCosines(0, 1, 0, 0, 0, 1, 1, 0, 0)
+
+            def _on_reslice_progress(obj, _event):
+                self.progress.emit(70 + int(obj.GetProgress() * 25))
+
+            reslice_tag = output.AddObserver("ProgressEvent", _on_reslice_progress)
+            output.Update()
+            output.RemoveObserver(reslice_tag)
+
+        # --- Done (100%) ---
+        self.progress.emit(100)
+
+        return SeriesEntry(
+            folder=folder,
+            reader=reader,
+            output=output,
+            spacing=spacing,
+            meta=meta,
+            num_slices=headers["num_files"],
+            headers=headers,
+        )
 
 
 # ===========================================================================
@@ -43,6 +134,15 @@ class DicomViewerWidget(QWidget):
     loading_progress = pyqtSignal(int)  # 0-100
     loading_finished = pyqtSignal()
 
+    _NO_CURSOR_TEXT = "R: --  C: --  HU: --"
+
+    # Series whose voxels stay in memory; older inactive ones are released
+    # and re-read in the background when switched back to
+    _MAX_RESIDENT_SERIES = 3
+
+    # Text properties are shared between overlays with the same style
+    _text_prop_cache: dict[tuple, vtkTextProperty] = {}
+
     def __init__(self, dicom_folder=None, view_orientation="axial", parent=None):
         super().__init__(parent)
         layout = QVBoxLayout(self)
@@ -101,29 +201,59 @@ class DicomViewerWidget(QWidget):
         self.view_orientation = view_orientation
         self.image_viewer = None
         self.roi_manager = ROIManager()
+        self._render_pending = False
+        self._render_suspended = False
+        self._closed = False
+
+        # Mouse-move overlay refresh, coalesced to ~60 Hz
+        self._pending_xy = None
+        self._overlay_timer = QTimer(self)
+        self._overlay_timer.setSingleShot(True)
+        self._overlay_timer.setInterval(16)
+        self._overlay_timer.timeout.connect(self._flush_overlay)
 
         # Active metadata (reflects the currently displayed series)
         self.dicom_spacing = [1.0, 1.0, 1.0]
         self.dicom_folder = dicom_folder
         self._dicom_meta = None
+        self._overlay_tl_text = "Patient: --"
+        self._overlay_tr_text = "--"
+        self._overlay_bl_fields = self._build_overlay_bl_fields({})
         self._dicom_num_slices = 0
         self._resliced_output = None
+        self._vol_np = None  # numpy view of _resliced_output, built on demand
+        self._img_geom = None  # (origin, spacing, dims) of _resliced_output
+        self._loc_strs = None  # "Loc: ..." line per slice, built on demand
         self._initial_parallel_scale = None
+        self._last_loaded_folder = None
 
         # Global W/L (synced across all series)
         self._ww = 400.0
         self._wl = 40.0
 
         # Series list and active index
-        self._series: list[dict] = []
+        self._series: list[SeriesEntry] = []
         self._active_series_idx = -1
-        self._combo_updating = False
+        # Series with their voxels in memory, least recently shown first
+        self._resident: list[SeriesEntry] = []
+        # Folder of a released series being re-read to be switched to
+        self._pending_switch: str | None = None
+
+        # Background loads run one at a time: (folder, replace_all)
+        self._loader: SeriesLoader | None = None
+        self._active_load: tuple[str, bool] | None = None
+        self._load_queue: list[tuple[str, bool]] = []
 
         # Overlay text actors
         self._overlay_tl = None
         self._overlay_tr = None
         self._overlay_bl = None
         self._overlay_br = None
+        # Last text pushed to each overlay's mapper, keyed by actor
+        self._overlay_text: dict = {}
+        self._cursor_text = self._NO_CURSOR_TEXT  # R/C/HU line of the BR overlay
+        self._br_head = ""  # zoom and W/L lines of the BR overlay
+        self._br_head_key = None
 
         # Placeholder label
         self.placeholder = QLabel("No DICOM series loaded.")
@@ -180,100 +310,35 @@ class DicomViewerWidget(QWidget):
                 label = combined
         return label
 
-    def _load_series_data(self, folder: str) -> dict:
-        folder_path = Path(folder)
-        series_name = folder_path.name
-
-        # --- Emit start (0%) ---
-        self.loading_started.emit(f"Loading: {series_name}")
-        self.loading_progress.emit(0)
-        QApplication.processEvents()
-
-        dcm_files = sorted(
-            f
-            for f in folder_path.iterdir()
-            if f.is_file() and not f.name.startswith(".")
-        )
-        num_slices = len(dcm_files)
-
-        # --- Reading metadata (~10%) ---
-        self.loading_progress.emit(10)
-        QApplication.processEvents()
-
-        meta = None
-        if dcm_files:
-            try:
-                meta = pydicom.dcmread(str(dcm_files[0]), stop_before_pixels=True)
-            except Exception:
-                pass
-
-        # --- VTK DICOM reader (10% → 70%) ---
-        reader = vtkDICOMImageReader()
-        reader.SetDirectoryName(folder)
-
-        def _on_reader_progress(obj, _event):
-            pct = 10 + int(obj.GetProgress() * 60)
-            self.loading_progress.emit(pct)
-            QApplication.processEvents()
-
-        reader_tag = reader.AddObserver("ProgressEvent", _on_reader_progress)
-        reader.Update()
-        reader.RemoveObserver(reader_tag)
-
-        self.loading_progress.emit(70)
-        QApplication.processEvents()
-
-        spacing = list(reader.GetOutput().GetSpacing())
-
-        # --- Reslice (70% → 95%) ---
-        reslice = vtkImageReslice()
-        reslice.SetInputConnection(reader.GetOutputPort())
-        if self.view_orientation == "coronal":
-            reslice.SetResliceAxesDirectionCosines(1, 0, 0, 0, 0, 1, 0, -1, 0)
-        elif self.view_orientation == "sagittal":
-            reslice.SetResliceAxesDirectionCosines(0, 1, 0, 0, 0, 1, 1, 0, 0)
-
-        def _on_reslice_progress(obj, _event):
-            pct = 70 + int(obj.GetProgress() * 25)
-            self.loading_progress.emit(pct)
-            QApplication.processEvents()
-
-        reslice_tag = reslice.AddObserver("ProgressEvent", _on_reslice_progress)
-        reslice.Update()
-        reslice.RemoveObserver(reslice_tag)
-
-        # --- Done (100%) ---
-        self.loading_progress.emit(100)
-        QApplication.processEvents()
-
-        return {
-            "folder": folder,
-            "reader": reader,
-            "reslice": reslice,
-            "spacing": spacing,
-            "meta": meta,
-            "num_slices": num_slices,
-            "label": self._build_series_label(folder, meta),
-        }
-
     def _update_series_combo(self):
-        self._combo_updating = True
-        self.series_combo.clear()
-        for i, s in enumerate(self._series):
-            self.series_combo.addItem(f"[{i + 1}]  {s['label']}", userData=i)
+        # Signals stay blocked while the items are rebuilt, so clear() and
+        # the repopulation do not bounce through _on_combo_changed
+        combo = self.series_combo
+        combo.blockSignals(True)
+        combo.clear()
+        combo.addItems([f"[{i + 1}]  {s.label}" for i, s in enumerate(self._series)])
         if 0 <= self._active_series_idx < len(self._series):
-            self.series_combo.setCurrentIndex(self._active_series_idx)
-        self._combo_updating = False
+            combo.setCurrentIndex(self._active_series_idx)
+        combo.blockSignals(False)
         has_multi = len(self._series) > 0
-        self._btn_remove_series.setEnabled(has_multi)
+        # Removal waits for a pending switch, so the active index is valid
+        self._btn_remove_series.setEnabled(has_multi and self._pending_switch is None)
         self.series_combo.setEnabled(has_multi)
 
-    def _activate_series_metadata(self, s: dict):
-        self._dicom_meta = s["meta"]
-        self._dicom_num_slices = s["num_slices"]
-        self._resliced_output = s["reslice"].GetOutput()
-        self.dicom_spacing = s["spacing"]
-        self.dicom_folder = s["folder"]
+    def _activate_series_metadata(self, s: SeriesEntry):
+        self._dicom_meta = s.meta
+        # Patient/study text and the series lines are fixed per series;
+        # build them once here
+        self._overlay_tl_text = self._build_overlay_tl_text(s.meta)
+        self._overlay_tr_text = self._build_overlay_tr_text(s.meta)
+        self._overlay_bl_fields = self._build_overlay_bl_fields(freeze_meta(s.meta))
+        self._dicom_num_slices = s.num_slices
+        self._resliced_output = img = s.output.GetOutput()
+        self._img_geom = (img.GetOrigin(), img.GetSpacing(), img.GetDimensions())
+        self._loc_strs = None
+        self._vol_np = None
+        self.dicom_spacing = s.spacing
+        self.dicom_folder = s.folder
 
     # ------------------------------------------------------------------
     # Public: load first (or replace all) series
@@ -285,10 +350,13 @@ class DicomViewerWidget(QWidget):
         self._slice_scrollbar.show()
         self.viewer_container.show()
 
-        series = self._load_series_data(folder)
+        # A fresh scan supersedes anything still waiting to be added
+        self._load_queue.clear()
+        self._enqueue_load(folder, True)
 
-        if not self._series and series["meta"] is not None:
-            ds = series["meta"]
+    def _apply_loaded_dicom(self, series: SeriesEntry):
+        if not self._series and series.meta is not None:
+            ds = series.meta
             ww = getattr(ds, "WindowWidth", None)
             wc = getattr(ds, "WindowCenter", None)
             if ww is not None and wc is not None:
@@ -296,58 +364,183 @@ class DicomViewerWidget(QWidget):
                 self._wl = float(wc[0] if hasattr(wc, "__len__") else wc)
 
         self._series = [series]
+        self._resident = [series]
+        self._pending_switch = None
         self._active_series_idx = 0
         self._activate_series_metadata(series)
-        self.dicom_spacing_changed.emit(self.dicom_spacing)
 
         if self.image_viewer is None:
             self._setup_vtk_pipeline(series)
         else:
-            self.image_viewer.SetInputConnection(series["reslice"].GetOutputPort())
+            self.image_viewer.SetInputConnection(series.output.GetOutputPort())
             self.image_viewer.UpdateDisplayExtent()
             style = self.interactor_style
             if style:
+                style.update_geometry()
                 style.min_slice = self.image_viewer.GetSliceMin()
                 style.max_slice = self.image_viewer.GetSliceMax()
                 style._set_slice(self.image_viewer.GetSliceMin())
                 self._configure_scrollbar(style.min_slice, style.max_slice, style.slice)
             self.image_viewer.SetColorWindow(self._ww)
             self.image_viewer.SetColorLevel(self._wl)
-            self._initial_parallel_scale = (
-                self.image_viewer.GetRenderer().GetActiveCamera().GetParallelScale()
-            )
+            # A different scan gets a fresh camera; reloading the same folder
+            # (e.g. on settings restore) keeps the current pan/zoom
+            if series.folder != self._last_loaded_folder:
+                ren = self.image_viewer.GetRenderer()
+                ren.ResetCamera()
+                self._initial_parallel_scale = ren.GetActiveCamera().GetParallelScale()
             self._update_all_overlays()
-            self.image_viewer.Render()
+            self.request_render()
 
+        self._last_loaded_folder = series.folder
         self._update_series_combo()
-        self.loading_finished.emit()
+        # Queued behind the render request: a spacing change can re-extract
+        # the lesion surface, which should not delay the new series' frame
+        spacing = list(self.dicom_spacing)
+        QTimer.singleShot(0, lambda: self.dicom_spacing_changed.emit(spacing))
 
     # ------------------------------------------------------------------
     # Public: add an additional series
     # ------------------------------------------------------------------
 
     def add_series(self, folder: str):
-        if not self._series:
+        if not self._series and not self.is_loading:
             self.load_dicom(folder)
             return
-        if any(s["folder"] == folder for s in self._series):
+        pending = list(self._load_queue)
+        if self._active_load is not None:
+            pending.append(self._active_load)
+        # A pending full reload will drop the current series, so only the
+        # queue decides whether this folder is a duplicate
+        known = [f for f, _ in pending]
+        if not any(replace for _, replace in pending):
+            known += self.loaded_folders
+        if folder in known:
             return
-        series = self._load_series_data(folder)
+        self._enqueue_load(folder, False)
+
+    def _apply_added_series(self, series: SeriesEntry):
         self._series.append(series)
+        self._keep_resident(series)
         self._update_series_combo()
-        self._switch_series(len(self._series) - 1)
+        # When several series are queued (e.g. a settings restore), only the
+        # last one is switched to and rendered
+        if not self._load_queue:
+            self._switch_series(len(self._series) - 1)
+
+    def _apply_reloaded_series(self, series: SeriesEntry):
+        """Swap a freshly read series in for its released entry; show it if
+        it is the pending switch target."""
+        idx = self.loaded_folders.index(series.folder)
+        self._series[idx] = series
+        self._keep_resident(series)
+        if series.folder == self._pending_switch:
+            self._pending_switch = None
+            self._update_series_combo()
+            self._switch_series(idx)
+
+    def _keep_resident(self, series: SeriesEntry):
+        """Mark *series* as most recently used and release the voxels of the
+        oldest inactive series beyond _MAX_RESIDENT_SERIES."""
+        if series in self._resident:
+            self._resident.remove(series)
+        self._resident.append(series)
+        active = (
+            self._series[self._active_series_idx]
+            if 0 <= self._active_series_idx < len(self._series)
+            else None
+        )
+        for s in self._resident[: -self._MAX_RESIDENT_SERIES]:
+            if s is not active:
+                self._resident.remove(s)
+                self._release_series_data(s)
+
+    @staticmethod
+    def _release_series_data(s: SeriesEntry):
+        """Free the voxel buffers of an inactive series."""
+        s.reader.GetOutput().ReleaseData()
+        if s.output is not s.reader:
+            s.output.GetOutput().ReleaseData()
+
+    # ------------------------------------------------------------------
+    # Background loading
+    # ------------------------------------------------------------------
+
+    @property
+    def is_loading(self) -> bool:
+        return self._active_load is not None or bool(self._load_queue)
+
+    def _enqueue_load(self, folder: str, replace: bool):
+        self._load_queue.append((folder, replace))
+        if self._active_load is None:
+            self._start_next_load()
+
+    def _start_next_load(self):
+        if not self._load_queue or self._closed:
+            return
+        folder, replace = self._active_load = self._load_queue.pop(0)
+        self.loading_started.emit(f"Loading: {Path(folder).name}")
+        self.loading_progress.emit(0)
+
+        loader = SeriesLoader(folder, self.view_orientation, self)
+        loader.progress.connect(self.loading_progress)
+        if replace:
+            # Header spacing lets the lesion dock update before pixels load
+            loader.spacing_ready.connect(self.dicom_spacing_changed)
+        loader.loaded.connect(lambda s, r=replace: self._on_series_loaded(s, r))
+        loader.failed.connect(self._on_series_failed)
+        loader.finished.connect(self._on_loader_finished)
+        self._loader = loader
+        loader.start()
+
+    def _on_series_loaded(self, series: SeriesEntry, replace: bool):
+        if self._closed:
+            return
+        series.label = self._build_series_label(series.folder, series.meta)
+        if replace or not self._series:
+            self._apply_loaded_dicom(series)
+        elif series.folder in self.loaded_folders:
+            self._apply_reloaded_series(series)
+        else:
+            self._apply_added_series(series)
+
+    def _on_series_failed(self, message: str):
+        folder = self._active_load[0]
+        print(f"Warning: could not load {folder}: {message}")
+        if folder == self._pending_switch:
+            self._pending_switch = None
+            self._update_series_combo()
+
+    def _on_loader_finished(self):
+        self._loader.deleteLater()
+        self._loader = None
+        self._active_load = None
+        if self._closed:
+            return
         self.loading_finished.emit()
+        if self._load_queue:
+            self._start_next_load()
+        else:
+            # One cache write per burst of loads (e.g. a settings restore)
+            flush_header_cache()
 
     # ------------------------------------------------------------------
     # Internal: remove active series
     # ------------------------------------------------------------------
 
     def _remove_active_series(self):
-        # if len(self._series) <= 1:
-        #     return
         idx = self._active_series_idx
-        self._series.pop(idx)
+        if not 0 <= idx < len(self._series):
+            return
+        removed = self._series.pop(idx)
+        if removed in self._resident:
+            self._resident.remove(removed)
         new_idx = max(0, idx - 1)
+        # Prefer the nearest series still in memory, so the switch is
+        # immediate instead of waiting on a background re-read
+        resident = [i for i, s in enumerate(self._series) if s in self._resident]
+        if resident:
+            new_idx = min(resident, key=lambda i: abs(i - new_idx))
         self._active_series_idx = -1
         self._update_series_combo()
         self._switch_series(new_idx)
@@ -357,7 +550,7 @@ class DicomViewerWidget(QWidget):
     # ------------------------------------------------------------------
 
     def _on_combo_changed(self, idx: int):
-        if self._combo_updating or idx < 0:
+        if idx < 0:
             return
         self._switch_series(idx)
 
@@ -371,15 +564,33 @@ class DicomViewerWidget(QWidget):
         if idx == self._active_series_idx:
             return
 
-        self._active_series_idx = idx
         s = self._series[idx]
+        if s not in self._resident:
+            # Released while inactive: re-read it off the GUI thread, keep
+            # showing the current series and switch once it has loaded
+            pending = [f for f, _ in self._load_queue]
+            if self._active_load is not None:
+                pending.append(self._active_load[0])
+            if s.folder not in pending:
+                self._enqueue_load(s.folder, False)
+            self._pending_switch = s.folder
+            self._update_series_combo()
+            if self._active_series_idx < 0:
+                self.series_combo.blockSignals(True)
+                self.series_combo.setCurrentIndex(idx)
+                self.series_combo.blockSignals(False)
+            return
+
+        self._active_series_idx = idx
+        self._keep_resident(s)
         self._activate_series_metadata(s)
 
-        self.image_viewer.SetInputConnection(s["reslice"].GetOutputPort())
+        self.image_viewer.SetInputConnection(s.output.GetOutputPort())
         self.image_viewer.UpdateDisplayExtent()
 
         style = self.interactor_style
         if style:
+            style.update_geometry()
             new_min = self.image_viewer.GetSliceMin()
             new_max = self.image_viewer.GetSliceMax()
             style.min_slice = new_min
@@ -391,43 +602,37 @@ class DicomViewerWidget(QWidget):
         self.image_viewer.SetColorWindow(self._ww)
         self.image_viewer.SetColorLevel(self._wl)
 
-        self._combo_updating = True
+        self.series_combo.blockSignals(True)
         self.series_combo.setCurrentIndex(idx)
-        self._combo_updating = False
+        self.series_combo.blockSignals(False)
 
         self._update_all_overlays()
-        self.image_viewer.Render()
+        self.request_render()
 
     # ------------------------------------------------------------------
     # Series dialog (button)
     # ------------------------------------------------------------------
 
     def _add_series_dialog(self):
-        folder = QFileDialog.getExistingDirectory(
-            self, "Select Additional DICOM Series Folder"
-        )
-        if folder:
-            self.add_series(folder)
+        pick_folder(self, "Select Additional DICOM Series Folder", self.add_series)
 
     # ------------------------------------------------------------------
     # First-time VTK pipeline setup (called once)
     # ------------------------------------------------------------------
 
-    def _setup_vtk_pipeline(self, series: dict):
+    def _setup_vtk_pipeline(self, series: SeriesEntry):
         self.image_viewer = vtkImageViewer2()
-        self.image_viewer.SetInputConnection(series["reslice"].GetOutputPort())
+        # Each render only maps the visible slice; thread start-up outweighs
+        # that work, so the per-slice stages run single-threaded
+        self.image_viewer.GetWindowLevel().SetNumberOfThreads(1)
+        self.image_viewer.GetImageActor().GetMapper().SetNumberOfThreads(1)
+        self.image_viewer.SetInputConnection(series.output.GetOutputPort())
         self.image_viewer.SetRenderWindow(self.vtk_widget.GetRenderWindow())
         self.image_viewer.SetupInteractor(self.vtk_widget)
 
         ren = self.image_viewer.GetRenderer()
         ren.SetBackground(self.colors.GetColor3d("Black"))
 
-        self.slice_text = self._make_text_actor(
-            "", 15, 10, 20, align_bottom=True, justify_right=False
-        )
-        self.slice_text.VisibilityOff()
-        ren.AddViewProp(self.slice_text)
-
         self._overlay_tl = self._make_text_actor(
             "", 0.01, 0.99, 13, normalized=True, align_bottom=False, justify_right=False
         )
@@ -447,10 +652,16 @@ class DicomViewerWidget(QWidget):
             self._overlay_br,
         ):
             ren.AddViewProp(actor)
+        self._overlay_text.clear()
 
         self.interactor_style = DrawingInteractorStyle(self)
         self.vtk_widget.SetInteractorStyle(self.interactor_style)
-        self.interactor_style.setup(self.image_viewer, self.slice_text)
+        self.interactor_style.setup(self.image_viewer)
+        # ROIs restored while no series could be shown wait detached
+        self.roi_manager.attach_all(ren)
+        self.roi_manager.update_visibility(
+            self.interactor_style.slice, self.image_viewer.GetSliceOrientation()
+        )
 
         self.image_viewer.Render()
         ren.ResetCamera()
@@ -460,7 +671,6 @@ class DicomViewerWidget(QWidget):
 
         self.vtk_widget.Initialize()
         self.vtk_widget.Start()
-        self._initial_parallel_scale = ren.GetActiveCamera().GetParallelScale()
 
         # Initialise scrollbar now that min/max are known
         self._configure_scrollbar(
@@ -473,16 +683,11 @@ class DicomViewerWidget(QWidget):
         interactor.AddObserver(
             vtkCommand.MouseMoveEvent, self._on_mouse_move_overlay, 0.5
         )
-        interactor.AddObserver(
-            vtkCommand.EndInteractionEvent, self._on_interaction_end, 0.5
-        )
-        interactor.AddObserver(
-            vtkCommand.MouseWheelForwardEvent, self._on_interaction_end, 0.5
-        )
-        interactor.AddObserver(
-            vtkCommand.MouseWheelBackwardEvent, self._on_interaction_end, 0.5
-        )
         interactor.AddObserver(vtkCommand.WindowLevelEvent, self._on_window_level, 0.5)
+        # Zoom and W/L changes always end in a render; refreshing the zoom/WL
+        # overlay as it starts keeps it in step without a second render.
+        # Slice changes refresh the bottom-left overlay from _set_slice.
+        ren.AddObserver(vtkCommand.StartEvent, self._on_render_start)
 
         self._update_all_overlays()
 
@@ -493,61 +698,63 @@ class DicomViewerWidget(QWidget):
     def _update_all_overlays(self):
         self._update_overlay_tl()
         self._update_overlay_tr()
-        self._update_overlay_bl()
+        self._update_cursor_overlays()
+
+    def _update_cursor_overlays(self):
+        """Refresh the two overlays that change with the cursor, slice and
+        camera. The top pair is fixed per series."""
         self._update_overlay_br()
+        self._update_overlay_bl()
+
+    def _set_overlay_text(self, actor, text: str) -> bool:
+        """SetInput only when *text* changed; the mapper re-renders its glyphs
+        on every SetInput, even for identical strings."""
+        if self._overlay_text.get(actor) == text:
+            return False
+        self._overlay_text[actor] = text
+        actor.GetMapper().SetInput(text)
+        return True
 
     # ------------------------------------------------------------------
     # Overlay: top-left – patient info
     # ------------------------------------------------------------------
 
     def _update_overlay_tl(self):
-        if not self._overlay_tl:
-            return
-        ds = self._dicom_meta
-        lines = []
-        if ds is not None:
-            pname = str(getattr(ds, "PatientName", "")) or "Unknown"
-            pid = str(getattr(ds, "PatientID", ""))
-            dob = str(getattr(ds, "PatientBirthDate", ""))
-            sex = str(getattr(ds, "PatientSex", ""))
-            if pname:
-                lines.append(pname)
-            details = "  ".join(filter(None, [pid, dob, sex]))
-            if details:
-                lines.append(details)
-        else:
-            lines.append("Patient: --")
-        self._overlay_tl.GetMapper().SetInput("\n".join(lines))
+        if self._overlay_tl:
+            self._set_overlay_text(self._overlay_tl, self._overlay_tl_text)
+
+    @staticmethod
+    def _build_overlay_tl_text(ds) -> str:
+        if ds is None:
+            return "Patient: --"
+        pname = str(getattr(ds, "PatientName", "")) or "Unknown"
+        pid = str(getattr(ds, "PatientID", ""))
+        dob = str(getattr(ds, "PatientBirthDate", ""))
+        sex = str(getattr(ds, "PatientSex", ""))
+        details = "  ".join(filter(None, [pid, dob, sex]))
+        return "\n".join(filter(None, [pname, details]))
 
     # ------------------------------------------------------------------
     # Overlay: top-right – scan date / study info
     # ------------------------------------------------------------------
 
     def _update_overlay_tr(self):
-        if not self._overlay_tr:
-            return
-        ds = self._dicom_meta
-        lines = []
-        if ds is not None:
-            study_date = str(getattr(ds, "StudyDate", "")) or "--"
-            study_desc = str(getattr(ds, "StudyDescription", ""))
-            series_desc = str(getattr(ds, "SeriesDescription", ""))
-            modality = str(getattr(ds, "Modality", ""))
-            institution = str(getattr(ds, "InstitutionName", ""))
-            if len(study_date) == 8 and study_date.isdigit():
-                study_date = f"{study_date[:4]}-{study_date[4:6]}-{study_date[6:]}"
-            lines.append(study_date)
-            if modality:
-                lines.append(modality)
-            if institution:
-                lines.append(institution)
-            if study_desc:
-                lines.append(study_desc)
-            if series_desc:
-                lines.append(series_desc)
-        else:
-            lines.append("--")
-        self._overlay_tr.GetMapper().SetInput("\n".join(lines))
+        if self._overlay_tr:
+            self._set_overlay_text(self._overlay_tr, self._overlay_tr_text)
+
+    @staticmethod
+    def _build_overlay_tr_text(ds) -> str:
+        if ds is None:
+            return "--"
+        study_date = str(getattr(ds, "StudyDate", "")) or "--"
+        study_desc = str(getattr(ds, "StudyDescription", ""))
+        series_desc = str(getattr(ds, "SeriesDescription", ""))
+        modality = str(getattr(ds, "Modality", ""))
+        institution = str(getattr(ds, "InstitutionName", ""))
+        if len(study_date) == 8 and study_date.isdigit():
+            study_date = f"{study_date[:4]}-{study_date[4:6]}-{study_date[6:]}"
+        parts = [study_date, modality, institution, study_desc, series_desc]
+        return "\n".join(filter(None, parts))
 
     # ------------------------------------------------------------------
     # Overlay: bottom-left – series / geometry info
@@ -565,92 +772,101 @@ class DicomViewerWidget(QWidget):
         # Keep scrollbar in sync whenever the overlay is refreshed
         self._update_scrollbar_value(slice_idx)
 
-        ds = self._dicom_meta
-        lines = [
-            "Series: --",
-            "Image: -- / --",
-            "Size: -- × -- px",
-            "Spacing: -- × -- mm",
-            "Loc: -- mm",
-            "Thick: -- mm",
-        ]
-
-        series_num = str(getattr(ds, "SeriesNumber", "--")) if ds else "--"
-        lines[0] = f"Series: {series_num}"
-
+        f = self._overlay_bl_fields
         total = self._dicom_num_slices if self._dicom_num_slices else "--"
-        lines[1] = f"Image: {slice_idx + 1} / {total}"
-
-        rows = str(getattr(ds, "Rows", "--")) if ds else "--"
-        cols = str(getattr(ds, "Columns", "--")) if ds else "--"
-        lines[2] = f"Size: {cols} \u00d7 {rows} px"
-
-        if ds:
-            ps = getattr(ds, "PixelSpacing", None)
-            if ps:
-                lines[3] = f"Spacing: {float(ps[0]):.2f} \u00d7 {float(ps[1]):.2f} mm"
-            loc = getattr(ds, "SliceLocation", None)
-        if self._resliced_output is not None:
-            img = self._resliced_output
-            origin = img.GetOrigin()
-            spacing = img.GetSpacing()
-            orient = self.image_viewer.GetSliceOrientation()
-            loc = origin[orient] + slice_idx * spacing[orient]
-            lines[4] = f"Loc: {loc:.2f} mm"
-        else:
-            loc = getattr(ds, "SliceLocation", None)
-            if loc is not None:
-                lines[4] = f"Loc: {float(loc):.2f} mm"
-        st = getattr(ds, "SliceThickness", None)
+        loc = f["loc"]
+        if self._img_geom is not None:
+            if self._loc_strs is None:
+                origin, spacing, dims = self._img_geom
+                o = self.image_viewer.GetSliceOrientation()
+                self._loc_strs = [
+                    f"Loc: {origin[o] + i * spacing[o]:.2f} mm" for i in range(dims[o])
+                ]
+            loc = "Loc: -- mm"
+            if 0 <= slice_idx < len(self._loc_strs):
+                loc = self._loc_strs[slice_idx]
+
+        text = (
+            f"{f['series']}\nImage: {slice_idx + 1} / {total}\n"
+            f"{f['size']}\n{f['spacing']}\n{loc}\n{f['thick']}"
+        )
+        self._set_overlay_text(self._overlay_bl, text)
+
+    @staticmethod
+    def _build_overlay_bl_fields(m: dict) -> dict:
+        """Per-series lines of the bottom-left overlay, from freeze_meta()."""
+        series_num = m.get("SeriesNumber")
+        rows = m.get("Rows")
+        cols = m.get("Columns")
+        rows = "--" if rows is None else rows
+        cols = "--" if cols is None else cols
+        fields = {
+            "series": f"Series: {'--' if series_num is None else series_num}",
+            "size": f"Size: {cols} \u00d7 {rows} px",
+            "spacing": "Spacing: -- \u00d7 -- mm",
+            "loc": "Loc: -- mm",  # only used without an image; see _loc_strs
+            "thick": "Thick: -- mm",
+        }
+        ps = m.get("PixelSpacing")
+        if ps:
+            fields["spacing"] = (
+                f"Spacing: {float(ps[0]):.2f} \u00d7 {float(ps[1]):.2f} mm"
+            )
+        loc = m.get("SliceLocation")
+        if loc is not None:
+            fields["loc"] = f"Loc: {float(loc):.2f} mm"
+        st = m.get("SliceThickness")
         if st:
-            lines[5] = f"Thick: {float(st):.2f} mm"
-
-        self._overlay_bl.GetMapper().SetInput("\n".join(lines))
+            fields["thick"] = f"Thick: {float(st):.2f} mm"
+        return fields
 
     # ------------------------------------------------------------------
     # Overlay: bottom-right – zoom / W-L / cursor
     # ------------------------------------------------------------------
 
-    def _update_overlay_br(self, display_x=None, display_y=None):
+    def _update_overlay_br(self) -> bool:
         if not self._overlay_br or not self.image_viewer:
-            return
-
-        lines = ["Zoom: --%", "W: --  L: --", "R: --  C: --  HU: --"]
-
-        ren = self.image_viewer.GetRenderer()
-        cam = ren.GetActiveCamera()
-        if self._initial_parallel_scale and self._initial_parallel_scale > 0:
-            zoom_pct = (self._initial_parallel_scale / cam.GetParallelScale()) * 100.0
-            lines[0] = f"Zoom: {zoom_pct:.0f}%"
-
-        lines[1] = f"W: {self._ww:.0f}  L: {self._wl:.0f}"
-
+            return False
+
+        # Zoom and W/L only change on camera or window/level edits; reformat
+        # them when their inputs change, not on every cursor move
+        cam = self.image_viewer.GetRenderer().GetActiveCamera()
+        key = (self._initial_parallel_scale, cam.GetParallelScale(), self._ww, self._wl)
+        if key != self._br_head_key:
+            zoom = "--"
+            if self._initial_parallel_scale and self._initial_parallel_scale > 0:
+                zoom_pct = (self._initial_parallel_scale / key[1]) * 100.0
+                zoom = f"{zoom_pct:.0f}"
+            self._br_head_key = key
+            self._br_head = f"Zoom: {zoom}%\nW: {self._ww:.0f}  L: {self._wl:.0f}\n"
+        text = self._br_head + self._cursor_text
+        return self._set_overlay_text(self._overlay_br, text)
+
+    def _set_cursor(self, display_x=None, display_y=None):
+        """Sample the voxel under the cursor for the R/C/HU line."""
+        info = None
         if display_x is not None and display_y is not None:
             info = self._get_pixel_info(display_x, display_y)
-            if info is not None:
-                row, col, val = info
-                lines[2] = f"R: {row}  C: {col}  HU: {val:.0f}"
-
-        self._overlay_br.GetMapper().SetInput("\n".join(lines))
+        if info is None:
+            self._cursor_text = self._NO_CURSOR_TEXT
+        else:
+            row, col, val = info
+            self._cursor_text = f"R: {row}  C: {col}  HU: {val:.0f}"
 
     # ------------------------------------------------------------------
     # Pixel sampling helper
     # ------------------------------------------------------------------
 
     def _get_pixel_info(self, display_x, display_y):
-        if not self.image_viewer or self._resliced_output is None:
+        if not self.image_viewer or self._img_geom is None or not self.interactor_style:
             return None
-        ren = self.image_viewer.GetRenderer()
-        picker = vtk.vtkWorldPointPicker()
-        picker.Pick(display_x, display_y, 0, ren)
-        wx, wy, wz = picker.GetPickPosition()
-
-        img = self._resliced_output
-        origin = img.GetOrigin()
-        spacing = img.GetSpacing()
-        dims = img.GetDimensions()
+        # Unprojects through the style's cached display matrix; no z-buffer
+        # read, unlike a vtkWorldPointPicker
+        wx, wy, wz = self.interactor_style.pick_world((display_x, display_y))
+
+        origin, spacing, dims = self._img_geom
         orient = self.image_viewer.GetSliceOrientation()
-        sl = self.interactor_style.slice if self.interactor_style else 0
+        sl = self.interactor_style.slice
 
         if orient == 2:
             i = int(round((wx - origin[0]) / spacing[0]))
@@ -666,8 +882,12 @@ class DicomViewerWidget(QWidget):
             k = int(round((wz - origin[2]) / spacing[2]))
 
         if 0 <= i < dims[0] and 0 <= j < dims[1] and 0 <= k < dims[2]:
-            val = img.GetScalarComponentAsDouble(i, j, k, 0)
-            return (j, i, val)
+            if self._vol_np is None:
+                # (k, j, i[, c]) view onto the VTK scalars; no copy
+                img = self._resliced_output
+                scalars = vtk_to_numpy(img.GetPointData().GetScalars())
+                self._vol_np = scalars.reshape(dims[2], dims[1], dims[0], -1)
+            return (j, i, float(self._vol_np[k, j, i, 0]))
         return None
 
     # ------------------------------------------------------------------
@@ -682,18 +902,67 @@ class DicomViewerWidget(QWidget):
     def _on_mouse_move_overlay(self, obj, event):
         if not self.image_viewer:
             return
+        # Only the latest position matters; the overlays are refreshed at
+        # most once per frame from _flush_overlay
         interactor = self.vtk_widget.GetRenderWindow().GetInteractor()
-        x, y = interactor.GetEventPosition()
-        self._update_overlay_br(x, y)
-        self._update_overlay_bl()
-        self.image_viewer.Render()
+        self._pending_xy = interactor.GetEventPosition()
+        if not self._overlay_timer.isActive():
+            self._overlay_timer.start()
 
-    def _on_interaction_end(self, obj, event):
+    def _flush_overlay(self):
+        if self._pending_xy is None or not self.image_viewer or self._closed:
+            return
+        x, y = self._pending_xy
+        self._pending_xy = None
+        style = self.interactor_style
+        if style and style.is_interacting:
+            # W/L, pan and zoom drags render on every move, which refreshes
+            # the overlays; the cursor readout is blanked and not picked
+            self._cursor_text = self._NO_CURSOR_TEXT
+            return
+        self._set_cursor(x, y)
+        if not self._update_overlay_br():
+            return
+        # Share the interactor style's frame throttle so overlay updates do
+        # not force an extra synchronous render per mouse move
+        if style:
+            style._schedule_render()
+        else:
+            self.request_render()
+
+    def _on_render_start(self, obj, event):
         self._update_overlay_br()
-        self._update_overlay_bl()
-        if self.image_viewer:
+
+    def request_render(self):
+        """Coalesce render requests into a single Render() once control
+        returns to the event loop."""
+        if not self._render_pending:
+            self._render_pending = True
+            QTimer.singleShot(0, self._flush_render)
+
+    def _flush_render(self):
+        self._render_pending = False
+        if self.image_viewer and not self._closed and not self._render_suspended:
             self.image_viewer.Render()
 
+    @property
+    def render_suspended(self) -> bool:
+        return self._render_suspended
+
+    def suspend_render(self):
+        """Drop render requests, from the viewer and its interactor style,
+        until resume_render(); used while a batch of changes lands."""
+        self._render_suspended = True
+
+    def resume_render(self):
+        """End suspend_render() with a single render of the final state."""
+        if self._render_suspended:
+            self._render_suspended = False
+            # The single render also covers a pending interactor render
+            if self.interactor_style:
+                self.interactor_style._render_timer.stop()
+            self.request_render()
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
@@ -702,10 +971,8 @@ class DicomViewerWidget(QWidget):
         if self.interactor_style:
             if tool != DrawTool.EDIT and self.image_viewer:
                 self.roi_manager.select(None, self.image_viewer.GetRenderer())
-                self.image_viewer.Render()
             self.interactor_style.draw_tool = tool
-            self.interactor_style._update_status()
-            self.interactor_style._render()
+            self.request_render()
 
     def finalize_roi(self, roi_type, points, slice_index, orientation):
         if not self.image_viewer:
@@ -722,23 +989,50 @@ class DicomViewerWidget(QWidget):
             points,
             renderer=ren,
         )
-        self.image_viewer.Render()
+        self.request_render()
 
     def delete_roi(self, roi_id):
         if self.image_viewer:
             self.roi_manager.remove_roi(roi_id, self.image_viewer.GetRenderer())
-            self.image_viewer.Render()
+            self.request_render()
 
     def select_roi(self, roi_id):
         if self.image_viewer:
             self.roi_manager.select(roi_id, self.image_viewer.GetRenderer())
-            self.image_viewer.Render()
+            self.request_render()
 
     @property
     def loaded_folders(self) -> list[str]:
-        return [s["folder"] for s in self._series]
+        return [s.folder for s in self._series]
 
     def cleanup(self):
+        self._closed = True
+        self._overlay_timer.stop()
+        self._load_queue.clear()
+        if self._loader is not None:
+            self._loader.wait()
+        flush_header_cache()
+        if self.interactor_style:
+            self.interactor_style._render_timer.stop()
+
+        # Drop the volumes, ROIs and actors now rather than whenever Qt and
+        # the garbage collector get to the widget; settings are saved already
+        self.roi_manager.blockSignals(True)
+        self.roi_manager.clear()
+        for s in self._series:
+            self._release_series_data(s)
+        self._series.clear()
+        self._resident.clear()
+        self._resliced_output = None
+        self._vol_np = None
+        self._loc_strs = None
+        self._dicom_meta = None
+        self._overlay_text.clear()
+        self._overlay_tl = self._overlay_tr = None
+        self._overlay_bl = self._overlay_br = None
+        if self.image_viewer:
+            self.image_viewer.GetRenderer().RemoveAllViewProps()
+
         if self.vtk_widget:
             rw = self.vtk_widget.GetRenderWindow()
             if rw:
@@ -760,21 +1054,26 @@ class DicomViewerWidget(QWidget):
         normalized=False,
         center=False,
     ):
-        tp = vtkTextProperty()
-        tp.SetFontFamilyToCourier()
-        tp.SetFontSize(size)
-        tp.SetColor(1.0, 1.0, 1.0)
-        (
-            tp.SetVerticalJustificationToBottom()
-            if align_bottom
-            else tp.SetVerticalJustificationToTop()
-        )
-        if center:
-            tp.SetJustificationToCentered()
-        elif justify_right:
-            tp.SetJustificationToRight()
-        else:
-            tp.SetJustificationToLeft()
+        justify = "center" if center else "right" if justify_right else "left"
+        key = (size, align_bottom, justify)
+        tp = self._text_prop_cache.get(key)
+        if tp is None:
+            tp = vtkTextProperty()
+            tp.SetFontFamilyToCourier()
+            tp.SetFontSize(size)
+            tp.SetColor(1.0, 1.0, 1.0)
+            (
+                tp.SetVerticalJustificationToBottom()
+                if align_bottom
+                else tp.SetVerticalJustificationToTop()
+            )
+            if center:
+                tp.SetJustificationToCentered()
+            elif justify_right:
+                tp.SetJustificationToRight()
+            else:
+                tp.SetJustificationToLeft()
+            self._text_prop_cache[key] = tp
 
         tm = vtkTextMapper()
         tm.SetInput(text)
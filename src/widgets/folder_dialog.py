@@ -0,0 +1,21 @@
+from PyQt6.QtWidgets import QFileDialog
+from PyQt6.QtCore import Qt
+
+# ===========================================================================
+# Folder picker
+# ===========================================================================
+
+
+def pick_folder(parent, caption: str, on_selected) -> QFileDialog:
+    """Open a directory picker and call *on_selected* with the chosen path.
+
+    Unlike ``QFileDialog.getExistingDirectory`` this returns immediately, so
+    no nested event loop runs while the dialog is up.
+    """
+    dlg = QFileDialog(parent, caption)
+    dlg.setFileMode(QFileDialog.FileMode.Directory)
+    dlg.setOption(QFileDialog.Option.ShowDirsOnly, True)
+    dlg.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+    dlg.fileSelected.connect(on_selected)
+    dlg.open()
+    return dlg